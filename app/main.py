@@ -1,6 +1,7 @@
 import streamlit as st
 import sys
 import os
+import time
 import uuid
 
 # Add the parent directory to the path so we can import our modules
@@ -10,14 +11,16 @@ from config.settings import settings
 from app.services.llm_service import LLMService
 from app.services.cv_generator import CVGenerator
 from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.document_pipeline import DocumentPipeline
 from app.utils.file_handler import FileHandler
 from app.utils.analytics import CVAnalytics
-from app.services.google_tracker import SilentGoogleTracker
+from app.utils.cv_model import ParsedCV
+from app.utils.cv_parser import parse_cv
+from app.utils.diff_renderer import DiffRenderer
+from app.utils.job_index import get_job_index
+from app.services.google_tracker import get_silent_tracker
 from app.services.pdf_generator import PDFGenerator
 
-# Create instance in main.py
-silent_tracker = SilentGoogleTracker()
-
 # Page configuration
 st.set_page_config(
     page_title="AI CV & Cover Letter Generator",
@@ -57,6 +60,8 @@ def initialize_session_state():
         st.session_state.cv_content = ""
     if 'job_description' not in st.session_state:
         st.session_state.job_description = ""
+    if 'job_desc_input' not in st.session_state:
+        st.session_state.job_desc_input = st.session_state.job_description
     if 'generated_cv' not in st.session_state:
         st.session_state.generated_cv = None
     if 'generated_cover_letter' not in st.session_state:
@@ -64,6 +69,54 @@ def initialize_session_state():
     if 'session_id' not in st.session_state:
         st.session_state.session_id = str(uuid.uuid4())[:8]
 
+def render_stream(chunks, placeholder, min_interval: float = 0.1) -> str:
+    """Render streamed text into a placeholder as it arrives and return the full text.
+
+    Updates are throttled to one every min_interval seconds, since each one is
+    a separate message to the browser.
+    """
+    parts = []
+    last_render = 0.0
+    for chunk in chunks:
+        parts.append(chunk)
+        now = time.monotonic()
+        if now - last_render >= min_interval:
+            placeholder.markdown("".join(parts) + "▌")
+            last_render = now
+    
+    text = "".join(parts)
+    placeholder.markdown(text)
+    return text
+
+def use_job_posting(posting: dict):
+    """Load a posting from the job index into the job description inputs"""
+    st.session_state.job_description = posting["job_description"]
+    st.session_state.job_desc_input = posting["job_description"]
+    if posting.get("company_name"):
+        st.session_state.company_name = posting["company_name"]
+
+def render_job_matches(parsed_cv: ParsedCV, top: int = 10):
+    """Best matching postings from the local job index, if there is one"""
+    index = get_job_index()
+    if len(index) == 0:
+        return
+    matches = index.search(parsed_cv, k=top)
+    if not matches:
+        return
+    
+    with st.expander(f"🔎 Best Matching Jobs ({len(index)} postings indexed)"):
+        st.dataframe(
+            [
+                {"Job": match["job_id"], "Company": match.get("company_name") or "", "Match %": match["match_percentage"]}
+                for match in matches
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+        labels = [f"{match['job_id']} ({match['match_percentage']}%)" for match in matches]
+        choice = st.selectbox("Posting", labels, key="job_match_choice")
+        st.button("Use this job description", on_click=use_job_posting, args=(matches[labels.index(choice)],))
+
 def main():
     initialize_session_state()
     
@@ -131,6 +184,14 @@ def main():
             help="Generate cover letters with different tones"
         )
         
+        use_cache = True
+        if settings.llm_cache_enabled:
+            use_cache = st.checkbox(
+                "Reuse Cached Generations",
+                value=True,
+                help="Return the saved result for identical inputs instead of generating a new one"
+            )
+        
         st.markdown("---")
         st.markdown("### 👀 Preview Options")
         preview_mode = st.selectbox(
@@ -161,12 +222,15 @@ def main():
                         st.session_state.cv_content = cv_text
                         st.success(f"✅ CV uploaded successfully! ({len(cv_text.split())} words)")
                         
-                        # Silent tracking - CV upload
-                        silent_tracker.track_cv_upload(
-                            cv_text, 
-                            uploaded_cv.name, 
-                            st.session_state.session_id
-                        )
+                        # Silent tracking - CV upload, once per distinct file rather than on every rerun
+                        upload_digest = FileHandler.file_digest(uploaded_cv)
+                        if st.session_state.get('tracked_upload_digest') != upload_digest:
+                            st.session_state.tracked_upload_digest = upload_digest
+                            get_silent_tracker().track_cv_upload(
+                                parse_cv(cv_text), 
+                                uploaded_cv.name, 
+                                st.session_state.session_id
+                            )
                         
                         with st.expander("📊 View CV Content"):
                             st.text_area("CV Content", cv_text, height=200, disabled=True)
@@ -195,9 +259,12 @@ def main():
         
         st.markdown('<div class="section-header">Job Description</div>', unsafe_allow_html=True)
         
+        if st.session_state.cv_content:
+            render_job_matches(parse_cv(st.session_state.cv_content))
+        
+        # Driven by its key alone, so use_job_posting can fill it in
         job_desc = st.text_area(
             "Paste the job description you're applying for",
-            value=st.session_state.job_description,
             height=300,
             placeholder="Copy and paste the complete job description here...",
             key="job_desc_input"
@@ -229,18 +296,22 @@ def main():
             if st.button("🎯 Generate Tailored CV", type="primary", use_container_width=True):
                 with st.spinner("Generating tailored CV..."):
                     try:
-                        cv_generator = CVGenerator()
+                        cv_generator = CVGenerator(use_cache=use_cache)
                         
                         user_preferences = {
                             "focus_areas": cv_focus,
                             "emphasize_keywords": True
                         }
                         
-                        generated_cv = cv_generator.generate_tailored_cv(
-                            st.session_state.cv_content,
-                            st.session_state.job_description,
-                            job_type=selected_job_type,
-                            user_preferences=user_preferences
+                        # Render the CV progressively as it is generated
+                        generated_cv = render_stream(
+                            cv_generator.stream_tailored_cv(
+                                st.session_state.cv_content,
+                                st.session_state.job_description,
+                                job_type=selected_job_type,
+                                user_preferences=user_preferences
+                            ),
+                            st.empty()
                         )
                         
                         st.session_state.generated_cv = generated_cv
@@ -254,7 +325,7 @@ def main():
                             else:
                                 cover_letter_text = str(st.session_state.generated_cover_letter)
                         
-                        silent_tracker.track_generation_results(
+                        get_silent_tracker().track_generation_results(
                             st.session_state.cv_content,
                             st.session_state.job_description,
                             generated_cv,
@@ -270,7 +341,7 @@ def main():
             if st.button("💌 Generate Cover Letter", type="primary", use_container_width=True):
                 with st.spinner("Generating cover letter..."):
                     try:
-                        cover_letter_generator = CoverLetterGenerator()
+                        cover_letter_generator = CoverLetterGenerator(use_cache=use_cache)
                         
                         company_info = {
                             "name": st.session_state.get("company_name", ""),
@@ -278,25 +349,23 @@ def main():
                         }
                         
                         if generate_multiple:
-                            generated_letters = {}
-                            tones = ["professional", "enthusiastic", "creative"]
+                            generated_letters = cover_letter_generator.generate_cover_letters(
+                                st.session_state.cv_content,
+                                st.session_state.job_description,
+                                company_info,
+                                tones=["professional", "enthusiastic", "creative"]
+                            )
                             
-                            for tone in tones:
-                                letter = cover_letter_generator.generate_cover_letter(
+                            st.session_state.generated_cover_letter = generated_letters
+                        else:
+                            generated_letter = render_stream(
+                                cover_letter_generator.stream_cover_letter(
                                     st.session_state.cv_content,
                                     st.session_state.job_description,
                                     company_info,
-                                    tone=tone
-                                )
-                                generated_letters[tone] = letter
-                            
-                            st.session_state.generated_cover_letter = generated_letters
-                        else:
-                            generated_letter = cover_letter_generator.generate_cover_letter(
-                                st.session_state.cv_content,
-                                st.session_state.job_description,
-                                company_info,
-                                tone=cover_letter_tone.lower()
+                                    tone=cover_letter_tone.lower()
+                                ),
+                                st.empty()
                             )
                             st.session_state.generated_cover_letter = {cover_letter_tone.lower(): generated_letter}
                         
@@ -309,7 +378,7 @@ def main():
                         else:
                             cover_letter_text = str(st.session_state.generated_cover_letter)
                         
-                        silent_tracker.track_generation_results(
+                        get_silent_tracker().track_generation_results(
                             st.session_state.cv_content,
                             st.session_state.job_description,
                             cv_text,
@@ -326,44 +395,59 @@ def main():
             if st.button("🚀 Generate Both Documents", use_container_width=True):
                 with st.spinner("Generating both documents..."):
                     try:
-                        # Generate CV
-                        cv_generator = CVGenerator()
-                        user_preferences = {"focus_areas": cv_focus, "emphasize_keywords": True}
-                        generated_cv = cv_generator.generate_tailored_cv(
-                            st.session_state.cv_content,
-                            st.session_state.job_description,
-                            job_type=selected_job_type,
-                            user_preferences=user_preferences
+                        pipeline = DocumentPipeline(
+                            CVGenerator(use_cache=use_cache),
+                            CoverLetterGenerator(use_cache=use_cache)
                         )
-                        st.session_state.generated_cv = generated_cv
-                        
-                        # Generate Cover Letter
-                        cover_letter_generator = CoverLetterGenerator()
+                        user_preferences = {"focus_areas": cv_focus, "emphasize_keywords": True}
                         company_info = {
                             "name": st.session_state.get("company_name", ""),
                             "hiring_manager": st.session_state.get("hiring_manager", ""),
                         }
                         
-                        generated_letter = cover_letter_generator.generate_cover_letter(
+                        # Generate CV and cover letter concurrently
+                        result = pipeline.generate_both(
                             st.session_state.cv_content,
                             st.session_state.job_description,
-                            company_info,
+                            job_type=selected_job_type,
+                            user_preferences=user_preferences,
+                            company_info=company_info,
                             tone=cover_letter_tone.lower()
                         )
-                        st.session_state.generated_cover_letter = {cover_letter_tone.lower(): generated_letter}
                         
-                        st.success("✅ Both documents generated successfully!")
+                        generated_cv = result["cv"]
+                        generated_letter = result["cover_letter"]
+                        if generated_cv:
+                            st.session_state.generated_cv = generated_cv
+                        if generated_letter:
+                            st.session_state.generated_cover_letter = {cover_letter_tone.lower(): generated_letter}
                         
-                        # Silent tracking - Both documents
-                        silent_tracker.track_generation_results(
-                            st.session_state.cv_content,
-                            st.session_state.job_description,
-                            generated_cv,
-                            generated_letter,
-                            st.session_state.session_id,
-                            st.session_state.get("company_name", "")
+                        if not result["errors"]:
+                            st.success("✅ Both documents generated successfully!")
+                        else:
+                            if "cv" in result["errors"]:
+                                st.error(f"❌ Error generating CV: {result['errors']['cv']}")
+                            if "cover_letter" in result["errors"]:
+                                st.error(f"❌ Error generating cover letter: {result['errors']['cover_letter']}")
+                        
+                        timings = result["timings"]
+                        st.caption(
+                            f"⏱️ CV: {timings.get('cv', '-')}s | "
+                            f"Cover letter: {timings.get('cover_letter', '-')}s | "
+                            f"Total: {timings['total']}s"
                         )
                         
+                        # Silent tracking - Both documents
+                        if generated_cv or generated_letter:
+                            get_silent_tracker().track_generation_results(
+                                st.session_state.cv_content,
+                                st.session_state.job_description,
+                                generated_cv or "",
+                                generated_letter or "",
+                                st.session_state.session_id,
+                                st.session_state.get("company_name", "")
+                            )
+                        
                     except Exception as e:
                         st.error(f"❌ Error: {str(e)}")
     
@@ -411,18 +495,14 @@ def main():
             
             elif preview_mode == "Diff Comparison" and st.session_state.cv_content and st.session_state.generated_cv:
                 st.markdown("### 🔍 CV Comparison")
-                original_lines = st.session_state.cv_content.split('\n')
-                generated_lines = st.session_state.generated_cv.split('\n')
-                
-                for i in range(max(len(original_lines), len(generated_lines))):
-                    original = original_lines[i] if i < len(original_lines) else ""
-                    generated = generated_lines[i] if i < len(generated_lines) else ""
-                    
-                    if original != generated:
-                        st.markdown(f'<div style="{preview_style} color: red;">- {original}</div>', unsafe_allow_html=True)
-                        st.markdown(f'<div style="{preview_style} color: green;">+ {generated}</div>', unsafe_allow_html=True)
-                    else:
-                        st.markdown(f'<div style="{preview_style}">  {original}</div>', unsafe_allow_html=True)
+                st.markdown(
+                    DiffRenderer.render_html(
+                        st.session_state.cv_content,
+                        st.session_state.generated_cv,
+                        style=preview_style
+                    ),
+                    unsafe_allow_html=True
+                )
         
         # Download section
         st.markdown("---")
@@ -469,13 +549,44 @@ def main():
                             mime="application/pdf",
                             use_container_width=True
                         )
+
+        # Bulk export when there is more than one document
+        export_sections = []
+        if st.session_state.generated_cv:
+            export_sections.append((f"tailored_cv_{cv_tone.lower()}", "Tailored CV", st.session_state.generated_cv))
+        if isinstance(st.session_state.generated_cover_letter, dict):
+            for version, content in st.session_state.generated_cover_letter.items():
+                export_sections.append((f"cover_letter_{version}", f"{version.title()} Cover Letter", content))
+
+        if len(export_sections) > 1:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="Download All (ZIP of PDFs)",
+                    data=PDFGenerator.generate_archive(
+                        {f"{name}.pdf": content for name, _, content in export_sections}
+                    ),
+                    file_name="application_documents.zip",
+                    mime="application/zip",
+                    use_container_width=True
+                )
+            with col2:
+                st.download_button(
+                    label="Download All (Single PDF)",
+                    data=PDFGenerator.generate_combined_pdf(
+                        [(title, content) for _, title, content in export_sections]
+                    ),
+                    file_name="application_documents.pdf",
+                    mime="application/pdf",
+                    use_container_width=True
+                )
     
     with tab4:
         st.markdown('<div class="section-header">Analytics & Insights</div>', unsafe_allow_html=True)
         
         if st.session_state.cv_content and st.session_state.job_description:
             CVAnalytics.display_analytics_dashboard(
-                st.session_state.cv_content, 
+                parse_cv(st.session_state.cv_content), 
                 st.session_state.job_description
             )
         else:
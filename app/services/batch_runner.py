@@ -0,0 +1,205 @@
+from .document_pipeline import DocumentPipeline
+from app.utils.analytics import CVAnalytics
+from app.utils.cv_model import ParsedCV
+from app.utils.cv_parser import parse_cv
+from config.settings import settings
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Set, Union
+import json
+import logging
+import os
+import time
+
+class BatchJob(NamedTuple):
+    job_id: str
+    job_description: str
+    company_name: str = ""
+    job_type: Optional[str] = None
+
+
+def load_jobs(path: str) -> Iterator[BatchJob]:
+    """
+    Read job descriptions from a directory (one .txt/.md file per job, the
+    file name is the job id) or from a JSONL file with one object per line:
+    {"job_id": ..., "job_description": ..., "company_name": ..., "job_type": ...}
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            stem, extension = os.path.splitext(name)
+            if extension.lower() not in ('.txt', '.md'):
+                continue
+            with open(os.path.join(path, name), encoding='utf-8') as f:
+                description = f.read().strip()
+            if description:
+                yield BatchJob(stem, description)
+        return
+
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logging.warning(f"Skipping line {line_number} of {path}: {str(e)}")
+                continue
+            description = record.get('job_description') or record.get('description') or ""
+            if not description.strip():
+                logging.warning(f"Skipping line {line_number} of {path}: no job description")
+                continue
+            yield BatchJob(
+                str(record.get('job_id') or record.get('id') or line_number),
+                description,
+                record.get('company_name', ""),
+                record.get('job_type')
+            )
+
+
+def completed_job_ids(output_path: str) -> Set[str]:
+    """Ids of jobs that already succeeded in an earlier run; the output file is the checkpoint"""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a partial last line
+                continue
+            if record.get('status') == 'ok':
+                done.add(record['job_id'])
+    return done
+
+
+class BatchRunner:
+    """Tailors one CV against many job descriptions without the Streamlit UI.
+
+    Jobs run with at most ``max_concurrency`` in flight. Each job generates
+    the CV and the cover letter concurrently through DocumentPipeline and
+    scores the keyword match before and after tailoring. Every finished job
+    is appended to the output JSONL straight away, so the output doubles as
+    the checkpoint: a rerun skips jobs already recorded as "ok" and retries
+    the rest.
+    """
+
+    def __init__(self, pipeline: DocumentPipeline = None, max_concurrency: int = None,
+                 include_cover_letter: bool = True):
+        self.pipeline = pipeline or DocumentPipeline()
+        self.max_concurrency = max(1, max_concurrency or settings.llm_max_concurrency)
+        self.include_cover_letter = include_cover_letter
+
+    def process_job(self, original_cv: Union[str, ParsedCV], job: BatchJob, job_type: str, tone: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        job_type = job.job_type or job_type
+        company_info = {"name": job.company_name} if job.company_name else None
+
+        if self.include_cover_letter:
+            result = self.pipeline.generate_both(
+                original_cv, job.job_description, job_type=job_type,
+                company_info=company_info, tone=tone
+            )
+        else:
+            result = {"cv": None, "cover_letter": None, "errors": {}}
+            try:
+                result["cv"] = self.pipeline.cv_generator.generate_tailored_cv(
+                    original_cv, job.job_description, job_type=job_type
+                )
+            except Exception as e:
+                result["errors"]["cv"] = str(e)
+
+        match_before = CVAnalytics.analyze_keyword_match(original_cv, job.job_description)['match_percentage']
+        match_after = None
+        if result["cv"]:
+            match_after = CVAnalytics.analyze_keyword_match(result["cv"], job.job_description)['match_percentage']
+
+        return {
+            "job_id": job.job_id,
+            "status": "error" if result["errors"] else "ok",
+            "company_name": job.company_name,
+            "cv": result["cv"],
+            "cover_letter": result["cover_letter"],
+            "errors": result["errors"],
+            "match_before": match_before,
+            "match_after": match_after,
+            "seconds": round(time.perf_counter() - started, 3),
+            "finished_at": datetime.now().isoformat()
+        }
+
+    def run(
+        self,
+        original_cv: str,
+        jobs: Iterator[BatchJob],
+        output_path: str,
+        job_type: str = "general",
+        tone: str = "professional",
+        resume: bool = True,
+        on_result: Callable[[Dict[str, Any], Dict[str, Any]], None] = None
+    ) -> Dict[str, Any]:
+        """
+        Process jobs and append one JSON line per job to output_path.
+        on_result(record, summary) is called after each job is written.
+        Returns a summary with counts, elapsed seconds and jobs per minute.
+        """
+        skip = completed_job_ids(output_path) if resume else set()
+        # Parsed once, every job shares its hash and keywords
+        parsed_cv = parse_cv(original_cv)
+        summary = {"ok": 0, "failed": 0, "skipped": 0, "elapsed": 0.0, "jobs_per_minute": 0.0}
+        started = time.perf_counter()
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # A run killed mid-write can leave the last line unterminated
+        needs_newline = False
+        if resume and os.path.exists(output_path) and os.path.getsize(output_path):
+            with open(output_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+
+        with open(output_path, 'a' if resume else 'w', encoding='utf-8') as output, \
+                ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            if needs_newline:
+                output.write("\n")
+            pending = {}
+
+            def collect(return_when):
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    job = pending.pop(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        record = {"job_id": job.job_id, "status": "error", "errors": {"job": str(e)},
+                                  "finished_at": datetime.now().isoformat()}
+                    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    output.flush()
+
+                    summary["ok" if record["status"] == "ok" else "failed"] += 1
+                    summary["elapsed"] = round(time.perf_counter() - started, 3)
+                    processed = summary["ok"] + summary["failed"]
+                    summary["jobs_per_minute"] = round(processed / summary["elapsed"] * 60, 2) if summary["elapsed"] else 0.0
+                    if on_result:
+                        on_result(record, summary)
+
+            try:
+                for job in jobs:
+                    if job.job_id in skip:
+                        summary["skipped"] += 1
+                        continue
+                    # Bound the jobs in flight, not just the workers, so large inputs stream through
+                    if len(pending) >= self.max_concurrency:
+                        collect(FIRST_COMPLETED)
+                    pending[executor.submit(self.process_job, parsed_cv, job, job_type, tone)] = job
+                collect(ALL_COMPLETED)
+            except KeyboardInterrupt:
+                # Finished jobs are already on disk; rerun to resume
+                for future in pending:
+                    future.cancel()
+                raise
+
+        summary["elapsed"] = round(time.perf_counter() - started, 3)
+        return summary
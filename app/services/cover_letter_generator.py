@@ -1,23 +1,42 @@
 from .llm_service import LLMService
-from typing import Dict, Any
+from .token_budget import TokenBudget
+from config.settings import settings
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.cv_model import ParsedCV, cv_text
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple, Union
 
 class CoverLetterGenerator:
-    def __init__(self):
-        self.llm_service = LLMService()
+    USER_PROMPT_TEMPLATE = """
+        CV Content:
+        {cv_content}
+        
+        Job Description:
+        {job_description}
+        
+        Company: {company_name}
+        Hiring Manager: {hiring_manager}
+        
+        Create a tailored cover letter that makes this candidate stand out for this specific role.
+        """
     
-    def generate_cover_letter(
-        self, 
-        cv_content: str, 
-        job_description: str, 
-        company_info: Dict[str, str] = None,
-        user_details: Dict[str, str] = None,
-        tone: str = "professional"
-    ) -> str:
+    # A 300-400 word letter
+    EXPECTED_OUTPUT_TOKENS = 600
+    
+    def __init__(self, use_cache: bool = True):
+        self.llm_service = LLMService(use_cache=use_cache)
+    
+    def _build_prompts(
+        self,
+        cv_content: Union[str, ParsedCV],
+        job_description: str,
+        company_info: Dict[str, str],
+        tone: str
+    ) -> Tuple[str, str, int]:
         
         company_name = company_info.get("name", "[Company Name]") if company_info else "[Company Name]"
         hiring_manager = company_info.get("hiring_manager", "Hiring Manager") if company_info else "Hiring Manager"
         
-        system_prompt = f"""
+        system_prompt = TokenBudget.compact_template(f"""
         You are an expert cover letter writer. Create a compelling, personalized cover letter that:
         
         1. Opens with a strong hook that shows genuine interest
@@ -36,19 +55,78 @@ class CoverLetterGenerator:
         - 1-2 body paragraphs with specific examples
         - Strong closing paragraph
         - Professional signature
-        """
+        """)
         
-        user_prompt = f"""
-        CV Content:
-        {cv_content}
+        # Compact the inputs and keep them within the prompt token budget
+        cv_content, job_description = TokenBudget.fit(cv_text(cv_content), job_description, settings.llm_prompt_token_budget)
         
-        Job Description:
-        {job_description}
+        user_prompt = TokenBudget.compact_template(self.USER_PROMPT_TEMPLATE).format(
+            cv_content=cv_content,
+            job_description=job_description,
+            company_name=company_name,
+            hiring_manager=hiring_manager
+        )
         
-        Company: {company_name}
-        Hiring Manager: {hiring_manager}
+        max_tokens = TokenBudget.completion_tokens(
+            self.EXPECTED_OUTPUT_TOKENS,
+            settings.llm_output_headroom,
+            settings.llm_min_output_tokens,
+            settings.llm_max_output_tokens
+        )
         
-        Create a tailored cover letter that makes this candidate stand out for this specific role.
+        return system_prompt, user_prompt, max_tokens
+    
+    def generate_cover_letter(
+        self, 
+        cv_content: Union[str, ParsedCV], 
+        job_description: str, 
+        company_info: Dict[str, str] = None,
+        user_details: Dict[str, str] = None,
+        tone: str = "professional"
+    ) -> str:
+        system_prompt, user_prompt, max_tokens = self._build_prompts(cv_content, job_description, company_info, tone)
+        return self.llm_service.generate_response(system_prompt, user_prompt, max_tokens=max_tokens)
+    
+    def stream_cover_letter(
+        self,
+        cv_content: Union[str, ParsedCV],
+        job_description: str,
+        company_info: Dict[str, str] = None,
+        user_details: Dict[str, str] = None,
+        tone: str = "professional"
+    ) -> Iterator[str]:
+        """Same as generate_cover_letter, but yields the letter in chunks as it is generated"""
+        system_prompt, user_prompt, max_tokens = self._build_prompts(cv_content, job_description, company_info, tone)
+        return self.llm_service.stream_response(system_prompt, user_prompt, max_tokens=max_tokens)
+    
+    def generate_cover_letters(
+        self,
+        cv_content: Union[str, ParsedCV],
+        job_description: str,
+        company_info: Dict[str, str] = None,
+        user_details: Dict[str, str] = None,
+        tones: Iterable[str] = ("professional", "enthusiastic", "creative"),
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        Generate one cover letter per tone, issuing the LLM requests concurrently.
+        Wall-clock time is bounded by the slowest request rather than their sum.
         """
+        tones = list(tones)
+        if not tones:
+            return {}
         
-        return self.llm_service.generate_response(system_prompt, user_prompt)
\ No newline at end of file
+        max_workers = max(1, min(max_concurrency or settings.llm_max_concurrency, len(tones)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                tone: executor.submit(
+                    self.generate_cover_letter,
+                    cv_content,
+                    job_description,
+                    company_info,
+                    user_details,
+                    tone
+                )
+                for tone in tones
+            }
+            return {tone: future.result() for tone, future in futures.items()}
\ No newline at end of file
@@ -1,9 +1,12 @@
 from .llm_service import LLMService
-from typing import Dict, Any
+from .token_budget import TokenBudget
+from config.settings import settings
+from app.utils.cv_model import ParsedCV, cv_text
+from typing import Dict, Any, Iterator, Tuple, Union
 
 class CVGenerator:
-    def __init__(self):
-        self.llm_service = LLMService()
+    def __init__(self, use_cache: bool = True):
+        self.llm_service = LLMService(use_cache=use_cache)
 
     # Role-specific system prompts for better agent context
     ROLE_PROMPTS = {
@@ -42,11 +45,32 @@ class CVGenerator:
         """
     }
 
-    def generate_tailored_cv(self, original_cv: str, job_description: str, job_type: str = "general", user_preferences: Dict[str, Any] = None) -> str:
+    USER_PROMPT_TEMPLATE = """
+        ORIGINAL CV:
+        {original_cv}
+
+        TARGET JOB DESCRIPTION:
+        {job_description}
+
+        TASK: Create a CV with 80%+ keyword match. 
+
+        REQUIREMENTS:
+        1. Keep ALL work experience but reorder by relevance to job
+        2. Extract and use these technical keywords from job description naturally
+        3. Replace vague achievements with specific numbers
+        4. Add missing skills mentioned in job posting to skills section
+        5. Optimize each section for maximum keyword density
+
+        Focus Areas: {focus_areas}
+
+        OUTPUT: Complete, keyword-optimized CV that will score 80%+ match with the job description.
+        """
+
+    def _build_prompts(self, original_cv: Union[str, ParsedCV], job_description: str, job_type: str, user_preferences: Dict[str, Any]) -> Tuple[str, str, int]:
         # Get role-specific base prompt
         base_prompt = self.ROLE_PROMPTS.get(job_type, self.ROLE_PROMPTS["general"])
 
-        system_prompt = f"""
+        system_prompt = TokenBudget.compact_template(f"""
         {base_prompt}
 
         CRITICAL REQUIREMENTS:
@@ -64,28 +88,33 @@ class CVGenerator:
         - Enhance technical skills section with job requirements
         - Strengthen achievements with specific metrics
         - Maintain professional formatting
-        """
+        """)
         
-        user_prompt = f"""
-        ORIGINAL CV:
-        {original_cv}
-
-        TARGET JOB DESCRIPTION:
-        {job_description}
-
-        TASK: Create a CV with 80%+ keyword match. 
-
-        REQUIREMENTS:
-        1. Keep ALL work experience but reorder by relevance to job
-        2. Extract and use these technical keywords from job description naturally
-        3. Replace vague achievements with specific numbers
-        4. Add missing skills mentioned in job posting to skills section
-        5. Optimize each section for maximum keyword density
+        # Compact the inputs and keep them within the prompt token budget
+        original_cv, job_description = TokenBudget.fit(cv_text(original_cv), job_description, settings.llm_prompt_token_budget)
+        
+        user_prompt = TokenBudget.compact_template(self.USER_PROMPT_TEMPLATE).format(
+            original_cv=original_cv,
+            job_description=job_description,
+            focus_areas=user_preferences.get('focus_areas', []) if user_preferences else ['Technical Skills', 'Achievements']
+        )
+        
+        # The tailored CV is roughly the original plus added keywords
+        max_tokens = TokenBudget.completion_tokens(
+            int(TokenBudget.estimate_tokens(original_cv) * 1.3),
+            settings.llm_output_headroom,
+            settings.llm_min_output_tokens,
+            settings.llm_max_output_tokens
+        )
+        
+        return system_prompt, user_prompt, max_tokens
 
-        Focus Areas: {user_preferences.get('focus_areas', []) if user_preferences else ['Technical Skills', 'Achievements']}
+    def generate_tailored_cv(self, original_cv: Union[str, ParsedCV], job_description: str, job_type: str = "general", user_preferences: Dict[str, Any] = None) -> str:
+        system_prompt, user_prompt, max_tokens = self._build_prompts(original_cv, job_description, job_type, user_preferences)
+        response = self.llm_service.generate_response(system_prompt, user_prompt, max_tokens=max_tokens)
+        return response
 
-        OUTPUT: Complete, keyword-optimized CV that will score 80%+ match with the job description.
-        """
-        
-        response = self.llm_service.generate_response(system_prompt, user_prompt)
-        return response
\ No newline at end of file
+    def stream_tailored_cv(self, original_cv: Union[str, ParsedCV], job_description: str, job_type: str = "general", user_preferences: Dict[str, Any] = None) -> Iterator[str]:
+        """Same as generate_tailored_cv, but yields the CV in chunks as it is generated"""
+        system_prompt, user_prompt, max_tokens = self._build_prompts(original_cv, job_description, job_type, user_preferences)
+        return self.llm_service.stream_response(system_prompt, user_prompt, max_tokens=max_tokens)
\ No newline at end of file
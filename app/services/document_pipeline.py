@@ -0,0 +1,82 @@
+from .cv_generator import CVGenerator
+from .cover_letter_generator import CoverLetterGenerator
+from config.settings import settings
+from concurrent.futures import ThreadPoolExecutor, wait
+from app.utils.cv_model import ParsedCV
+from typing import Dict, Any, Optional, Union
+import logging
+import time
+
+class DocumentPipeline:
+    """Generates the tailored CV and the cover letter concurrently.
+
+    Neither document depends on the other, so both LLM requests are issued at
+    once under a shared deadline. A failure or timeout in one leg does not
+    discard the other: the result carries whatever finished plus per-stage
+    errors and timings.
+    """
+
+    def __init__(self, cv_generator: CVGenerator = None, cover_letter_generator: CoverLetterGenerator = None):
+        self.cv_generator = cv_generator or CVGenerator()
+        self.cover_letter_generator = cover_letter_generator or CoverLetterGenerator()
+
+    def generate_both(
+        self,
+        original_cv: Union[str, ParsedCV],
+        job_description: str,
+        job_type: str = "general",
+        user_preferences: Dict[str, Any] = None,
+        company_info: Dict[str, str] = None,
+        tone: str = "professional",
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Run both generations concurrently.
+
+        Returns a dict with "cv" and "cover_letter" (None for a failed leg),
+        "errors" mapping each failed stage to its message, and "timings" with
+        per-stage and total wall-clock seconds.
+        """
+        deadline = deadline if deadline is not None else settings.llm_request_deadline
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def run_stage(stage, func, *args, **kwargs):
+            stage_start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings[stage] = round(time.perf_counter() - stage_start, 3)
+
+        executor = ThreadPoolExecutor(max_workers=2)
+        futures = {
+            "cv": executor.submit(
+                run_stage, "cv", self.cv_generator.generate_tailored_cv,
+                original_cv, job_description, job_type=job_type, user_preferences=user_preferences
+            ),
+            "cover_letter": executor.submit(
+                run_stage, "cover_letter", self.cover_letter_generator.generate_cover_letter,
+                original_cv, job_description, company_info, tone=tone
+            )
+        }
+        wait(futures.values(), timeout=deadline)
+        # Don't block on a leg that overran the deadline
+        executor.shutdown(wait=False)
+
+        result: Dict[str, Any] = {"cv": None, "cover_letter": None, "errors": {}}
+        for stage, future in futures.items():
+            if not future.done():
+                future.cancel()
+                result["errors"][stage] = f"Timed out after {deadline:.0f} seconds"
+            elif future.exception() is not None:
+                result["errors"][stage] = str(future.exception())
+            else:
+                result[stage] = future.result()
+
+        for stage, error in result["errors"].items():
+            logging.warning(f"Document pipeline stage '{stage}' failed: {error}")
+
+        # Snapshot, a timed-out leg may still record its timing later
+        result["timings"] = dict(timings)
+        result["timings"]["total"] = round(time.perf_counter() - started, 3)
+        return result
@@ -0,0 +1,51 @@
+import groq
+import httpx
+import threading
+from config.settings import settings
+
+class LLMClientRegistry:
+    """Process-wide Groq clients, one per API key, each with a pooled HTTP client.
+
+    Streamlit imports this module once per process, so every session and
+    rerun reuses the same keep-alive connections and TLS sessions instead of
+    opening new ones for each button click. httpx clients are thread-safe,
+    so a client can be shared by concurrent generations.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, api_key: str) -> groq.Groq:
+        client = self._clients.get(api_key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(api_key)
+                if client is None:
+                    client = self._create_client(api_key)
+                    self._clients[api_key] = client
+        return client
+
+    @staticmethod
+    def _create_client(api_key: str) -> groq.Groq:
+        limits = httpx.Limits(
+            max_connections=settings.llm_pool_max_connections,
+            max_keepalive_connections=settings.llm_pool_max_keepalive,
+            keepalive_expiry=settings.llm_pool_keepalive_expiry
+        )
+        # Retries are handled by LLMService's retry policy, not by the SDK
+        return groq.Groq(
+            api_key=api_key,
+            max_retries=0,
+            http_client=groq.DefaultHttpxClient(limits=limits)
+        )
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+# Global instance
+llm_client_registry = LLMClientRegistry()
@@ -1,28 +1,76 @@
 import groq
 from config.settings import settings
+from .llm_client import llm_client_registry
+from .response_cache import response_cache, ResponseCache
+from .rate_limiter import request_limiter, circuit_breaker, retry_policy, RateLimitTimeout
 import logging
 import time
-from typing import Optional
+from typing import Iterator, Optional
 
 class LLMService:
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         if not settings.groq_api_key:
             raise ValueError("GROQ_API_KEY not found in environment variables")
 
-        # Initialize Groq client
-        self.client = groq.Groq(api_key=settings.groq_api_key)
+        # Shared, pooled Groq client
+        self.client = llm_client_registry.get_client(settings.groq_api_key)
         self.model = "openai/gpt-oss-120b"
         self.max_retries = 3
-        self.retry_delay = 2  # seconds
+        # Response cache is opt-in (LLM_CACHE_ENABLED); use_cache=False bypasses it
+        self.use_cache = use_cache
 
-    def generate_response(self, system_prompt: str, user_prompt: str, temperature: float = 0.2, max_tokens: int = 2048) -> str:
+    def _cache_key(self, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int, use_cache: Optional[bool]) -> Optional[str]:
+        """Cache key for this request, or None when caching is off for it"""
+        if not settings.llm_cache_enabled:
+            return None
+        if not (self.use_cache if use_cache is None else use_cache):
+            return None
+        return ResponseCache.make_key(self.model, system_prompt, user_prompt, temperature, max_tokens)
+
+    def _before_request(self):
+        """Fail fast while the circuit is open, then wait for a rate-limit token"""
+        circuit_breaker.before_request()
+        if not request_limiter.acquire(timeout=settings.llm_rate_limit_max_wait):
+            raise RateLimitTimeout("Too many requests right now, please try again in a moment")
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        """Record a failed attempt and sleep before the next one if it is worth retrying"""
+        if not retry_policy.is_retryable(error):
+            logging.error(f"Non-retryable error (attempt {attempt + 1}/{self.max_retries}): {str(error)}")
+            return False
+
+        delay = retry_policy.delay(error, attempt)
+        if retry_policy.is_rate_limited(error):
+            # Hold back every session until the limit resets
+            request_limiter.pause(delay)
+        else:
+            circuit_breaker.record_failure()
+
+        if isinstance(error, groq.APIError):
+            logging.warning(f"Groq API error (attempt {attempt + 1}/{self.max_retries}): {str(error)}")
+        else:
+            logging.error(f"Unexpected error (attempt {attempt + 1}/{self.max_retries}): {str(error)}")
+
+        if attempt >= self.max_retries - 1:
+            return False
+        time.sleep(delay)
+        return True
+
+    def generate_response(self, system_prompt: str, user_prompt: str, temperature: float = 0.2, max_tokens: int = 2048, use_cache: Optional[bool] = None) -> str:
         """
         Generate response with enhanced error handling and retry logic.
         """
+        cache_key = self._cache_key(system_prompt, user_prompt, temperature, max_tokens, use_cache)
+        if cache_key:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         last_exception = None
 
         for attempt in range(self.max_retries):
             try:
+                self._before_request()
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=[
@@ -33,25 +81,78 @@ class LLMService:
                     max_tokens=max_tokens,
                     timeout=30  # Add timeout for better reliability
                 )
+                circuit_breaker.record_success()
 
                 if response.choices and len(response.choices) > 0:
-                    return response.choices[0].message.content
+                    content = response.choices[0].message.content
+                    if cache_key and content:
+                        response_cache.set(cache_key, content)
+                    return content
                 else:
                     raise Exception("No response generated by the model")
 
-            except groq.APIError as e:
+            except Exception as e:
                 last_exception = e
-                logging.warning(f"Groq API error (attempt {attempt + 1}/{self.max_retries}): {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))  # Exponential backoff
+                if not self._should_retry(e, attempt):
+                    break
+
+        # If all retries failed
+        error_msg = f"Failed to generate content after {attempt + 1} attempts: {str(last_exception)}"
+        logging.error(error_msg)
+        raise Exception(error_msg)
+
+    def stream_response(self, system_prompt: str, user_prompt: str, temperature: float = 0.2, max_tokens: int = 2048, use_cache: Optional[bool] = None) -> Iterator[str]:
+        """
+        Stream the response as text chunks as soon as the model produces them.
+        Failures before the first chunk are retried like generate_response;
+        once output has started, errors are raised to the caller.
+        """
+        cache_key = self._cache_key(system_prompt, user_prompt, temperature, max_tokens, use_cache)
+        if cache_key:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        last_exception = None
+
+        for attempt in range(self.max_retries):
+            started = False
+            parts = []
+            try:
+                self._before_request()
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    timeout=30,
+                    stream=True
+                )
+                circuit_breaker.record_success()
+
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        started = True
+                        parts.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+
+                if not started:
+                    raise Exception("No response generated by the model")
+                if cache_key:
+                    response_cache.set(cache_key, "".join(parts))
+                return
 
             except Exception as e:
+                if started:
+                    raise
                 last_exception = e
-                logging.error(f"Unexpected error (attempt {attempt + 1}/{self.max_retries}): {str(e)}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                if not self._should_retry(e, attempt):
+                    break
 
-        # If all retries failed
-        error_msg = f"Failed to generate content after {self.max_retries} attempts: {str(last_exception)}"
+        error_msg = f"Failed to generate content after {attempt + 1} attempts: {str(last_exception)}"
         logging.error(error_msg)
         raise Exception(error_msg)
\ No newline at end of file
@@ -1,27 +1,321 @@
 from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
+from config.settings import settings
+from app.utils.cache import LRUCache, content_hash
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+import re
+import zipfile
+
+# Rendered PDF bytes keyed by content and layout, shared across sessions and reruns
+_pdf_cache = LRUCache(settings.pdf_cache_size, max_bytes=settings.pdf_cache_max_bytes)
+
+class FontMetrics:
+    """Glyph widths for one font, measured once per character and cached.
+
+    Widths are kept at size 1 and scaled, so every size of a font shares the
+    same table. The standard PDF fonts have no kerning, so a string's width
+    is the sum of its glyph widths.
+    """
+
+    _instances: Dict[str, "FontMetrics"] = {}
+
+    def __init__(self, font_name: str):
+        self.font_name = font_name
+        self._widths: Dict[str, float] = {}
+
+    @classmethod
+    def for_font(cls, font_name: str) -> "FontMetrics":
+        metrics = cls._instances.get(font_name)
+        if metrics is None:
+            metrics = cls._instances.setdefault(font_name, cls(font_name))
+        return metrics
+
+    def width(self, text: str, font_size: float) -> float:
+        try:
+            return sum(map(self._widths.__getitem__, text)) * font_size
+        except KeyError:
+            for char in set(text) - self._widths.keys():
+                self._widths[char] = stringWidth(char, self.font_name, 1)
+            return sum(map(self._widths.__getitem__, text)) * font_size
+
+
+class Line(NamedTuple):
+    text: str
+    font_name: str
+    font_size: float
+    x: float
+    y: float
+
+
+class TextLayout:
+    """Wraps, styles and paginates plain or lightly marked-up text in one pass.
+
+    Recognised structure, one block per source line:
+    - headings: ``# Title``, ``**Title**`` or short ALL CAPS lines
+    - bullets: lines starting with ``-``, ``*``, ``•`` or ``·``
+    - blank lines: paragraph spacing
+    Everything else is a paragraph, word-wrapped to the text width.
+    """
+
+    BULLET = "•"
+
+    _HEADING_MARKUP_RE = re.compile(r'^#{1,6}\s+(.*?)\s*#*$|^\*\*([^*]+)\*\*:?$')
+    _BULLET_RE = re.compile(r'^[-*•·]\s+(.*)$')
+
+    def __init__(self, page_size: Tuple[float, float], margin: float, font_name: str, font_size: float,
+                 leading: float, heading_font_name: str, heading_font_size: float, bullet_indent: float):
+        self.width, self.height = page_size
+        self.margin = margin
+        self.font_name = font_name
+        self.font_size = font_size
+        self.leading = leading
+        self.heading_font_name = heading_font_name
+        self.heading_font_size = heading_font_size
+        self.heading_leading = leading * heading_font_size / font_size
+        self.bullet_indent = bullet_indent
+        self.text_width = self.width - 2 * margin
+
+    def classify(self, line: str) -> Tuple[str, str]:
+        """Return (kind, text) with kind one of 'blank', 'heading', 'bullet', 'paragraph'"""
+        stripped = line.strip()
+        if not stripped:
+            return 'blank', ''
+        match = self._HEADING_MARKUP_RE.match(stripped)
+        if match:
+            return 'heading', match.group(1) or match.group(2)
+        match = self._BULLET_RE.match(stripped)
+        if match:
+            return 'bullet', match.group(1)
+        if stripped.isupper() and len(stripped.split()) <= 6 and any(char.isalpha() for char in stripped):
+            return 'heading', stripped
+        return 'paragraph', line.rstrip()
+
+    def wrap(self, text: str, font_name: str, font_size: float, max_width: float) -> List[str]:
+        """Greedy word wrap; words wider than a whole line are split by character"""
+        metrics = FontMetrics.for_font(font_name)
+        words = text.split()
+        # Most lines fit as they are, measure them whole before going word by word
+        line = ' '.join(words)
+        if metrics.width(line, font_size) <= max_width:
+            return [line]
+
+        space_width = metrics.width(' ', font_size)
+        lines: List[str] = []
+        current: List[str] = []
+        current_width = 0.0
+
+        for word in words:
+            word_width = metrics.width(word, font_size)
+            if word_width > max_width:
+                if current:
+                    lines.append(' '.join(current))
+                    current, current_width = [], 0.0
+                word, word_width = self._break_word(word, metrics, font_size, max_width, lines)
+            if current and current_width + space_width + word_width > max_width:
+                lines.append(' '.join(current))
+                current, current_width = [], 0.0
+            if current:
+                current_width += space_width
+            current.append(word)
+            current_width += word_width
+
+        if current:
+            lines.append(' '.join(current))
+        return lines
+
+    @staticmethod
+    def _break_word(word: str, metrics: FontMetrics, font_size: float, max_width: float,
+                    lines: List[str]) -> Tuple[str, float]:
+        """Append full-width pieces of word to lines and return the remainder with its width"""
+        start, width = 0, 0.0
+        for i, char in enumerate(word):
+            char_width = metrics.width(char, font_size)
+            if width + char_width > max_width and i > start:
+                lines.append(word[start:i])
+                start, width = i, 0.0
+            width += char_width
+        return word[start:], width
+
+    def layout(self, content: str) -> Iterator[List[Line]]:
+        """Yield the positioned lines of each page"""
+        top = self.height - self.margin
+        pages: List[List[Line]] = []
+        page: List[Line] = []
+        y = top
+
+        def place(text: str, font_name: str, font_size: float, x: float, leading: float):
+            nonlocal page, y
+            if y < self.margin:
+                # Blank lines alone can run past the bottom; such a page is dropped, not emitted empty
+                if page:
+                    pages.append(page)
+                page, y = [], top
+            page.append(Line(text, font_name, font_size, x, y))
+            y -= leading
+
+        for source_line in content.split('\n'):
+            kind, text = self.classify(source_line)
+            if kind == 'blank':
+                y -= self.leading
+            elif kind == 'heading':
+                # Keep some space above headings, except at the top of a page
+                if page and y < top:
+                    y -= self.leading / 2
+                for wrapped in self.wrap(text, self.heading_font_name, self.heading_font_size, self.text_width):
+                    place(wrapped, self.heading_font_name, self.heading_font_size, self.margin, self.heading_leading)
+            elif kind == 'bullet':
+                indent = self.margin + self.bullet_indent
+                wrapped_lines = self.wrap(text, self.font_name, self.font_size, self.text_width - self.bullet_indent)
+                for i, wrapped in enumerate(wrapped_lines):
+                    if i == 0:
+                        # The bullet glyph hangs in the indent, level with the first line
+                        place(self.BULLET, self.font_name, self.font_size, self.margin + self.bullet_indent / 3, 0)
+                    place(wrapped, self.font_name, self.font_size, indent, self.leading)
+            else:
+                # Preserve leading indentation of plain lines
+                indent_chars = len(text) - len(text.lstrip())
+                x = self.margin + FontMetrics.for_font(self.font_name).width(text[:indent_chars], self.font_size)
+                for wrapped in self.wrap(text, self.font_name, self.font_size, self.text_width - (x - self.margin)):
+                    place(wrapped, self.font_name, self.font_size, x, self.leading)
+
+            while pages:
+                yield pages.pop(0)
+
+        if page:
+            yield page
+
 
 class PDFGenerator:
+    PAGE_SIZE = letter
+    FONT_NAME = "Helvetica"
+    FONT_SIZE = 12
+    HEADING_FONT_NAME = "Helvetica-Bold"
+    HEADING_FONT_SIZE = 14
+    BULLET_INDENT = 14
+    MARGIN = 40
+    LEADING = 15
+
+    @staticmethod
+    def _layout_key():
+        """Everything besides the content that affects the rendered output"""
+        return (PDFGenerator.PAGE_SIZE, PDFGenerator.FONT_NAME, PDFGenerator.FONT_SIZE,
+                PDFGenerator.HEADING_FONT_NAME, PDFGenerator.HEADING_FONT_SIZE,
+                PDFGenerator.BULLET_INDENT, PDFGenerator.MARGIN, PDFGenerator.LEADING)
+
+    @staticmethod
+    def _text_layout() -> TextLayout:
+        return TextLayout(
+            PDFGenerator.PAGE_SIZE, PDFGenerator.MARGIN, PDFGenerator.FONT_NAME, PDFGenerator.FONT_SIZE,
+            PDFGenerator.LEADING, PDFGenerator.HEADING_FONT_NAME, PDFGenerator.HEADING_FONT_SIZE,
+            PDFGenerator.BULLET_INDENT
+        )
+
+    @staticmethod
+    def _cached(cache_key, render) -> bytes:
+        data = _pdf_cache.get(cache_key)
+        if data is None:
+            data = render()
+            _pdf_cache.set(cache_key, data)
+        return data
+
     @staticmethod
     def generate_pdf(content, filename="document.pdf"):
+        """
+        Render content to a PDF. Output is memoized by content and layout, so
+        reruns of the Results tab don't rebuild the canvas; each call returns
+        a fresh buffer over the cached bytes.
+        """
+        cache_key = (content_hash(content), PDFGenerator._layout_key())
+        return BytesIO(PDFGenerator._cached(cache_key, lambda: PDFGenerator._render(content)))
+
+    @staticmethod
+    def generate_archive(documents: Dict[str, str]) -> BytesIO:
+        """
+        Render several documents, given as {file name: content}, into one ZIP
+        of PDFs. The archive is memoized by names, content and layout like
+        generate_pdf, so reruns of the Results tab don't re-zip it.
+        """
+        cache_key = (
+            "archive",
+            tuple((name, content_hash(content)) for name, content in documents.items()),
+            PDFGenerator._layout_key()
+        )
+        return BytesIO(PDFGenerator._cached(cache_key, lambda: PDFGenerator._build_archive(documents)))
+
+    @staticmethod
+    def _build_archive(documents: Dict[str, str]) -> bytes:
+        """
+        Documents are rendered in a thread pool so they share the process-wide
+        glyph width tables and PDF cache, and each one is written to the
+        archive as soon as it and the ones before it are ready.
+        """
+        buffer = BytesIO()
+        workers = max(1, min(settings.pdf_workers, len(documents)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(name, executor.submit(PDFGenerator.generate_pdf, content))
+                       for name, content in documents.items()]
+            # PDFs are already compressed, storing them again only costs time
+            with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+                for name, future in futures:
+                    archive.writestr(name, future.result().getvalue())
+        return buffer.getvalue()
+
+    @staticmethod
+    def generate_combined_pdf(sections: List[Tuple[str, str]]) -> BytesIO:
+        """
+        Render (title, content) sections into a single PDF. Each section starts
+        on a new page and gets an outline entry; all sections share one canvas
+        and its font resources.
+        """
+        cache_key = (
+            tuple((title, content_hash(content)) for title, content in sections),
+            PDFGenerator._layout_key()
+        )
+        return BytesIO(PDFGenerator._cached(cache_key, lambda: PDFGenerator._render_sections(sections)))
+
+    @staticmethod
+    def _render(content) -> bytes:
         buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=letter)
-        width, height = letter
-        
-        # Set up styles
-        c.setFont("Helvetica", 12)
-        y_position = height - 40
-        
-        # Add content with proper formatting
-        for line in content.split('\n'):
-            if y_position < 40:
-                c.showPage()
-                y_position = height - 40
-                c.setFont("Helvetica", 12)
-            c.drawString(40, y_position, line)
-            y_position -= 15
-        
+        c = canvas.Canvas(buffer, pagesize=PDFGenerator.PAGE_SIZE)
+        PDFGenerator._draw(c, PDFGenerator._text_layout(), content)
         c.save()
-        buffer.seek(0)
-        return buffer
\ No newline at end of file
+        return buffer.getvalue()
+
+    @staticmethod
+    def _render_sections(sections: List[Tuple[str, str]]) -> bytes:
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=PDFGenerator.PAGE_SIZE)
+        layout = PDFGenerator._text_layout()
+        for i, (title, content) in enumerate(sections):
+            key = f"section-{i}"
+            c.bookmarkPage(key)
+            c.addOutlineEntry(title, key, level=0)
+            PDFGenerator._draw(c, layout, content)
+        c.showOutline()
+        c.save()
+        return buffer.getvalue()
+
+    @staticmethod
+    def _draw(c: canvas.Canvas, layout: TextLayout, content: str):
+        """Draw content onto c, ending with a finished page"""
+        # One text object per page; the font is only set when it changes
+        drawn = False
+        for page in layout.layout(content):
+            drawn = True
+            text = c.beginText()
+            font = None
+            for line in page:
+                if (line.font_name, line.font_size) != font:
+                    font = (line.font_name, line.font_size)
+                    text.setFont(*font)
+                text.setTextOrigin(line.x, line.y)
+                # textLine, unlike textOut, doesn't re-measure the string to advance the cursor
+                text.textLine(line.text)
+            c.drawText(text)
+            c.showPage()
+        if not drawn:
+            # Empty content still gets a (blank) page
+            c.showPage()
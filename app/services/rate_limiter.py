@@ -0,0 +1,183 @@
+import groq
+import random
+import re
+import threading
+import time
+from config.settings import settings
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+class CircuitOpenError(Exception):
+    """Raised when requests are short-circuited after repeated failures"""
+
+
+class RateLimitTimeout(Exception):
+    """Raised when no request slot frees up within the allowed wait"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the request rate of the whole process.
+
+    All sessions share one instance, so after a 429 every caller waits for the
+    same reset time instead of retrying in lockstep.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a token; returns False if none is available within timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate if self.rate else 1.0)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold all callers back, e.g. until a rate limit resets"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Stops sending requests after consecutive failures, then probes again.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast for ``reset_timeout`` seconds. Calls are then let through again:
+    a success closes the circuit, another failure reopens it straight away.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def before_request(self):
+        if self.is_open:
+            raise CircuitOpenError("LLM service is temporarily unavailable after repeated failures, please try again shortly")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """Full-jitter exponential backoff that honours server rate-limit hints"""
+
+    RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+    _DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, (CircuitOpenError, RateLimitTimeout)):
+            return False
+        if isinstance(error, groq.APIStatusError):
+            return error.status_code in self.RETRYABLE_STATUS_CODES
+        # Connection errors, timeouts and unexpected failures
+        return True
+
+    @staticmethod
+    def is_rate_limited(error: Exception) -> bool:
+        return isinstance(error, groq.APIStatusError) and error.status_code == 429
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before the next attempt"""
+        hinted = self.retry_after(error)
+        if hinted is not None:
+            # Small jitter so waiting callers don't all resume at once
+            return min(self.max_delay, hinted) + random.uniform(0, self.base_delay)
+        return self.backoff(attempt)
+
+    @classmethod
+    def parse_duration(cls, value: str) -> Optional[float]:
+        """Parse durations like '7.66s', '2m59.56s' or '250ms'"""
+        value = value.strip()
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        parts = cls._DURATION_RE.findall(value)
+        if not parts or ''.join(number + unit for number, unit in parts) != value:
+            return None
+        scale = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+        return sum(float(number) * scale[unit] for number, unit in parts)
+
+    @classmethod
+    def retry_after(cls, error: Exception) -> Optional[float]:
+        """Delay requested by the server via Retry-After or rate-limit headers"""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return None
+
+        retry_after_ms = headers.get('retry-after-ms')
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+
+        retry_after = headers.get('retry-after')
+        if retry_after:
+            seconds = cls.parse_duration(retry_after)
+            if seconds is not None:
+                return seconds
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+        # Groq reports when each exhausted quota resets
+        delays = []
+        for quota in ('requests', 'tokens'):
+            if headers.get(f'x-ratelimit-remaining-{quota}') == '0':
+                reset = headers.get(f'x-ratelimit-reset-{quota}')
+                seconds = cls.parse_duration(reset) if reset else None
+                if seconds is not None:
+                    delays.append(seconds)
+        return max(delays) if delays else None
+
+# Global instances, shared by every session in the process
+request_limiter = TokenBucket(settings.llm_rate_limit_rpm / 60, settings.llm_rate_limit_burst)
+circuit_breaker = CircuitBreaker(settings.llm_breaker_threshold, settings.llm_breaker_reset_timeout)
+retry_policy = RetryPolicy(settings.llm_retry_base_delay, settings.llm_retry_max_delay)
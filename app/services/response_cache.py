@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from config.settings import settings
+from typing import Optional
+
+class ResponseCache:
+    """On-disk cache of LLM responses, stored in SQLite.
+
+    Entries are keyed by a hash of everything that determines the completion
+    (model, prompts, temperature and max_tokens), expire after ``ttl`` seconds
+    and are evicted least-recently-used beyond ``max_entries``. SQLite handles
+    locking, so the cache can be shared by threads and by several processes.
+    Cache errors are logged and treated as misses, never raised.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_entries: int = 1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, user_prompt: str, temperature: float, max_tokens: int) -> str:
+        payload = json.dumps([model, system_prompt, user_prompt, temperature, max_tokens])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    # The connection's context manager only commits; closing() closes it too
+                    with closing(sqlite3.connect(self.path, timeout=5)) as conn, conn:
+                        conn.execute(
+                            "CREATE TABLE IF NOT EXISTS responses ("
+                            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                        )
+                        conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+                    self._initialized = True
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    row = conn.execute(
+                        "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    response, created_at = row
+                    if self.ttl and created_at + self.ttl <= now:
+                        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        return None
+                    conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                    return response
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Response cache read failed: {str(e)}")
+            return None
+
+    def set(self, key: str, response: str):
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, response, now, now)
+                    )
+                    if self.ttl:
+                        conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+                    conn.execute(
+                        "DELETE FROM responses WHERE key IN ("
+                        "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,)
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Response cache write failed: {str(e)}")
+
+    def clear(self):
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM responses")
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logging.warning(f"Response cache clear failed: {str(e)}")
+
+# Global instance, only consulted when LLM_CACHE_ENABLED is set
+response_cache = ResponseCache(settings.llm_cache_path, settings.llm_cache_ttl, settings.llm_cache_max_entries)
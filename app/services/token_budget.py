@@ -0,0 +1,117 @@
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+# Section headings whose content rarely helps tailoring, dropped first when
+# a prompt is over budget. A heading must name one of these as a whole (or
+# several joined by "&", "and", "," or "/"), so "Research Interests" or
+# "Data Privacy Requirements" are kept.
+LOW_SIGNAL_SECTIONS = frozenset({
+    'about us', 'about the company', 'who we are', 'our story', 'our mission',
+    'benefits', 'perks', 'what we offer', 'compensation', 'salary',
+    'equal opportunity', 'equal opportunity employer', 'equal employment', 'diversity',
+    'eeo', 'eeo statement', 'how to apply', 'application process',
+    'privacy', 'privacy notice', 'disclaimer', 'references', 'hobbies', 'interests'
+})
+
+class TokenBudget:
+    """Local token accounting and prompt compaction for LLM requests.
+
+    Token counts are estimated (about four characters per token for English
+    text), which is close enough to size budgets without a tokenizer.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    _SPACES_RE = re.compile(r'[ \t\f\v]+')
+    _BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+    _HEADING_MARKUP_RE = re.compile(r'^[#*\s]+|[*:\s]+$')
+    _HEADING_JOIN_RE = re.compile(r'\s*(?:&|/|,|\band\b)\s*')
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return math.ceil(len(text) / TokenBudget.CHARS_PER_TOKEN) if text else 0
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def compact_template(template: str) -> str:
+        """Strip the source-code indentation and blank-line runs from a prompt template"""
+        lines = [line.strip() for line in template.strip().split('\n')]
+        return TokenBudget._BLANK_LINES_RE.sub('\n\n', '\n'.join(lines))
+
+    @staticmethod
+    def compact_text(text: str) -> str:
+        """Collapse redundant whitespace in user content, keeping its line structure"""
+        lines = [TokenBudget._SPACES_RE.sub(' ', line).strip() for line in text.strip().split('\n')]
+        return TokenBudget._BLANK_LINES_RE.sub('\n\n', '\n'.join(lines))
+
+    @staticmethod
+    def _is_heading(line: str) -> bool:
+        stripped = line.strip()
+        if not stripped or len(stripped.split()) > 6:
+            return False
+        return (stripped.endswith(':') or stripped.startswith(('#', '**'))
+                or (stripped.isupper() and any(char.isalpha() for char in stripped)))
+
+    @staticmethod
+    def _is_low_signal_heading(line: str) -> bool:
+        heading = ' '.join(TokenBudget._HEADING_MARKUP_RE.sub('', line).lower().split())
+        names = [name for name in TokenBudget._HEADING_JOIN_RE.split(heading) if name]
+        return bool(names) and all(name in LOW_SIGNAL_SECTIONS for name in names)
+
+    @staticmethod
+    def drop_low_signal_sections(text: str) -> str:
+        """Remove sections such as benefits, EEO statements or hobbies"""
+        kept: List[str] = []
+        skipping = False
+        for line in text.split('\n'):
+            if TokenBudget._is_heading(line):
+                skipping = TokenBudget._is_low_signal_heading(line)
+            if not skipping:
+                kept.append(line)
+        return '\n'.join(kept).strip()
+
+    @staticmethod
+    def truncate(text: str, max_tokens: int) -> str:
+        """Cut text at a line boundary so it fits within max_tokens"""
+        max_chars = max_tokens * TokenBudget.CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        cut = text.rfind('\n', 0, max_chars)
+        return text[:cut if cut > 0 else max_chars].rstrip() + '\n[...]'
+
+    @staticmethod
+    def fit(cv_content: str, job_description: str, budget: int) -> Tuple[str, str]:
+        """
+        Compact a CV and job description and trim them to a combined token budget.
+        Low-signal sections go first, then the job description is shortened;
+        the CV is only truncated as a last resort.
+        """
+        cv_content = TokenBudget.compact_text(cv_content)
+        job_description = TokenBudget.compact_text(job_description)
+
+        def total() -> int:
+            return TokenBudget.estimate_tokens(cv_content) + TokenBudget.estimate_tokens(job_description)
+
+        if total() <= budget:
+            return cv_content, job_description
+
+        job_description = TokenBudget.drop_low_signal_sections(job_description)
+        if total() > budget:
+            cv_content = TokenBudget.drop_low_signal_sections(cv_content)
+        if total() > budget:
+            # Keep at least a quarter of the budget for the job description
+            job_budget = max(budget - TokenBudget.estimate_tokens(cv_content), budget // 4)
+            job_description = TokenBudget.truncate(job_description, job_budget)
+        if total() > budget:
+            cv_content = TokenBudget.truncate(cv_content, budget - TokenBudget.estimate_tokens(job_description))
+            logging.warning("CV truncated to fit the prompt token budget")
+
+        return cv_content, job_description
+
+    @staticmethod
+    def completion_tokens(expected_output_tokens: int, headroom: int, minimum: int, maximum: int) -> int:
+        """max_tokens for a request, sized to the expected output plus reasoning headroom"""
+        return max(minimum, min(maximum, expected_output_tokens + headroom))
@@ -0,0 +1,367 @@
+import gspread
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Tracking sheet layout: CV upload rows are appended with all columns, the
+# generation results later fill Company_Name..Job_Keywords of that row
+SESSION_COLUMN = 1
+GENERATION_START_COLUMN = 13  # zero-based, column N
+GENERATION_COLUMN_COUNT = 4   # N..Q
+
+
+class TrackingEvent(NamedTuple):
+    """A pending tracker write.
+
+    ``kind`` is "append" (a new CV upload row) or "update" (generation
+    results for the session's row). ``build`` produces the row values and
+    runs on the writer thread, so parsing stays off the request path.
+    """
+    kind: str
+    session_id: str
+    build: Callable[[], List]
+
+
+class TrackingSink(ABC):
+    """Destination of tracker batches"""
+
+    @abstractmethod
+    def append_rows(self, rows: List[List]):
+        """Append upload rows in order"""
+
+    @abstractmethod
+    def update_sessions(self, updates: Dict[str, List]):
+        """Write generation values into the first row of each session"""
+
+
+class GoogleSheetsSink(TrackingSink):
+    """Writes to the first worksheet of a Google spreadsheet.
+
+    Keeps a session_id -> row number index so generation results are
+    written without re-reading the sheet. The index is filled from the
+    session column once, then kept current from the range each append
+    reports. Sessions it doesn't know (e.g. rows written by another
+    process) trigger a re-read at most every ``index_refresh_interval``
+    seconds.
+
+    The worksheet handle is opened once and reused for ``handle_ttl``
+    seconds. A 400/404 from the API (sheet deleted, replaced or renamed)
+    drops the handle and the row index, and the call is retried once with
+    a fresh handle. The gspread client, and with it the credentials and
+    their access token, is reused for the life of the process; google-auth
+    refreshes the token when it expires.
+    """
+
+    _UPDATED_RANGE_RE = re.compile(r'![A-Z]+(\d+):[A-Z]+(\d+)$')
+    STALE_HANDLE_STATUS_CODES = {400, 404}
+
+    def __init__(self, client, spreadsheet_id: str, index_refresh_interval: float = 60,
+                 handle_ttl: float = 3600):
+        self.client = client
+        self.spreadsheet_id = spreadsheet_id
+        self.index_refresh_interval = index_refresh_interval
+        self.handle_ttl = handle_ttl
+        self._row_index: Optional[Dict[str, int]] = None
+        self._index_loaded_at = 0.0
+        self._worksheet_handle = None
+        self._handle_opened_at = 0.0
+
+    def _worksheet(self):
+        now = time.monotonic()
+        if self._worksheet_handle is None or now - self._handle_opened_at > self.handle_ttl:
+            self._worksheet_handle = self.client.open_by_key(self.spreadsheet_id).sheet1
+            self._handle_opened_at = now
+        return self._worksheet_handle
+
+    def _with_worksheet(self, action: Callable):
+        """Run action(worksheet), refreshing a stale handle once"""
+        try:
+            return action(self._worksheet())
+        except gspread.exceptions.APIError as e:
+            if getattr(e.response, 'status_code', None) not in self.STALE_HANDLE_STATUS_CODES:
+                raise
+            logging.debug(f"Refreshing tracker worksheet handle: {str(e)}")
+            self._worksheet_handle = None
+            self._row_index = None
+            return action(self._worksheet())
+
+    @staticmethod
+    def _column_letter(index: int) -> str:
+        """Zero-based column index to A1 letters"""
+        letters = ""
+        index += 1
+        while index:
+            index, remainder = divmod(index - 1, 26)
+            letters = chr(ord('A') + remainder) + letters
+        return letters
+
+    def _load_index(self, worksheet):
+        """Read the session column once, first row per session"""
+        index: Dict[str, int] = {}
+        for i, session_id in enumerate(worksheet.col_values(SESSION_COLUMN + 1)):
+            if session_id:
+                index.setdefault(session_id, i + 1)
+        self._row_index = index
+        self._index_loaded_at = time.monotonic()
+
+    def append_rows(self, rows: List[List]):
+        response = self._with_worksheet(lambda worksheet: worksheet.append_rows(rows, value_input_option='RAW'))
+        if self._row_index is None:
+            return
+
+        updated_range = ((response or {}).get('updates') or {}).get('updatedRange', '')
+        match = self._UPDATED_RANGE_RE.search(updated_range)
+        if match is None or int(match.group(2)) - int(match.group(1)) + 1 != len(rows):
+            # Can't tell where the rows landed, rebuild on next use
+            self._row_index = None
+            return
+        first_row = int(match.group(1))
+        for offset, row in enumerate(rows):
+            self._row_index.setdefault(str(row[SESSION_COLUMN]), first_row + offset)
+
+    def update_sessions(self, updates: Dict[str, List]):
+        self._with_worksheet(lambda worksheet: self._update_sessions(worksheet, updates))
+
+    def _update_sessions(self, worksheet, updates: Dict[str, List]):
+        if self._row_index is None:
+            self._load_index(worksheet)
+        elif (any(session_id not in self._row_index for session_id in updates)
+                and time.monotonic() - self._index_loaded_at > self.index_refresh_interval):
+            self._load_index(worksheet)
+
+        start = self._column_letter(GENERATION_START_COLUMN)
+        end = self._column_letter(GENERATION_START_COLUMN + GENERATION_COLUMN_COUNT - 1)
+        data = [
+            {'range': f"{start}{row_num}:{end}{row_num}", 'values': [values]}
+            for session_id, values in updates.items()
+            for row_num in [self._row_index.get(session_id)]
+            if row_num is not None
+        ]
+        # One range update for the whole batch
+        if data:
+            worksheet.batch_update(data, value_input_option='RAW')
+
+
+class SQLiteSink(TrackingSink):
+    """Local stand-in for the spreadsheet, one JSON-encoded row per record"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # The connection's context manager only commits; closing() closes it too
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tracking ("
+                "row_num INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL, row TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tracking_session_id ON tracking (session_id)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def append_rows(self, rows: List[List]):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO tracking (session_id, row) VALUES (?, ?)",
+                    [(str(row[SESSION_COLUMN]), json.dumps(row)) for row in rows]
+                )
+        finally:
+            conn.close()
+
+    def update_sessions(self, updates: Dict[str, List]):
+        conn = self._connect()
+        try:
+            with conn:
+                for session_id, values in updates.items():
+                    found = conn.execute(
+                        "SELECT row_num, row FROM tracking WHERE session_id = ? ORDER BY row_num LIMIT 1",
+                        (session_id,)
+                    ).fetchone()
+                    if found is None:
+                        continue
+                    row_num, row = found[0], json.loads(found[1])
+                    row[GENERATION_START_COLUMN:GENERATION_START_COLUMN + GENERATION_COLUMN_COUNT] = values
+                    conn.execute("UPDATE tracking SET row = ? WHERE row_num = ?", (json.dumps(row), row_num))
+        finally:
+            conn.close()
+
+    def rows(self) -> List[List]:
+        conn = self._connect()
+        try:
+            return [json.loads(row) for (row,) in conn.execute("SELECT row FROM tracking ORDER BY row_num")]
+        finally:
+            conn.close()
+
+
+class BatchedTrackerWriter:
+    """Single background writer that batches tracker events.
+
+    Events go into a bounded queue; when it is full new events are dropped
+    and counted rather than blocking the Streamlit request. The writer
+    thread flushes when ``batch_size`` events are pending or
+    ``flush_interval`` seconds after the first one, coalescing the batch:
+    repeated updates for a session keep only the latest, and an update for
+    a row appended in the same batch is merged into that row.
+    """
+
+    def __init__(self, sink: TrackingSink, max_queue: int = 1000, batch_size: int = 50,
+                 flush_interval: float = 5.0):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._backpressure_logged_at = 0.0
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.failures = 0
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="tracker-writer", daemon=True)
+                    self._thread.start()
+
+    def submit(self, event: TrackingEvent) -> bool:
+        """Queue an event without blocking; returns False if it was dropped"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+                now = time.monotonic()
+                # Rate-limit the warning, a full queue can mean many drops per second
+                if now - self._backpressure_logged_at > 60:
+                    self._backpressure_logged_at = now
+                    logging.warning(f"Tracker queue full, dropping events ({self.dropped} dropped so far)")
+            return False
+        with self._stats_lock:
+            self.submitted += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far; returns False on timeout"""
+        done = threading.Event()
+        self._ensure_started()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            # A full queue behind a stalled sink must not block past the timeout either
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def _run(self):
+        while True:
+            batch: List[TrackingEvent] = []
+            flushed: List[threading.Event] = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    flushed.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            for event in flushed:
+                event.set()
+
+    def _write(self, batch: List[TrackingEvent]):
+        appends: List[List] = []
+        append_index: Dict[str, int] = {}
+        updates: Dict[str, Callable[[], List]] = {}
+        coalesced = 0
+        for event in batch:
+            if event.kind == "append":
+                row = self._build(event)
+                if row is not None:
+                    append_index.setdefault(event.session_id, len(appends))
+                    appends.append(row)
+            else:
+                # Only the latest update per session is written
+                coalesced += event.session_id in updates
+                updates[event.session_id] = event.build
+
+        merged: Dict[str, List] = {}
+        for session_id, build in updates.items():
+            values = self._build(TrackingEvent("update", session_id, build))
+            if values is None:
+                continue
+            if session_id in append_index:
+                row = appends[append_index[session_id]]
+                row[GENERATION_START_COLUMN:GENERATION_START_COLUMN + GENERATION_COLUMN_COUNT] = values
+                coalesced += 1
+            else:
+                merged[session_id] = values
+
+        try:
+            if appends:
+                self.sink.append_rows(appends)
+            if merged:
+                self.sink.update_sessions(merged)
+        except Exception as e:
+            # Tracking is best-effort, the batch is dropped
+            with self._stats_lock:
+                self.failures += 1
+                self.dropped += len(batch)
+            logging.debug(f"Tracker batch write failed: {str(e)}")
+            return
+
+        with self._stats_lock:
+            self.batches += 1
+            self.written += len(appends) + len(merged)
+            self.coalesced += coalesced
+
+    def _build(self, event: TrackingEvent) -> Optional[List]:
+        try:
+            return event.build()
+        except Exception as e:
+            with self._stats_lock:
+                self.dropped += 1
+            logging.debug(f"Tracker event for session {event.session_id} failed: {str(e)}")
+            return None
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            depth = self._queue.qsize()
+            return {
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "written": self.written,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "failures": self.failures,
+                "queue_depth": depth,
+                # Share of the queue in use, 1.0 means new events are being dropped
+                "backpressure": round(depth / self._queue.maxsize, 3) if self._queue.maxsize else 0.0
+            }
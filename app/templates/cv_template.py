@@ -1,11 +1,11 @@
-from typing import Dict, List
+from typing import Dict, Union
+from app.utils.cv_model import ExperienceEntry, ParsedCV
+from .template_engine import CompiledTemplate, compile_template
 
-class CVTemplate:
-    @staticmethod
-    def format_professional_cv(cv_data: Dict) -> str:
-        """Format CV data into a professional template"""
-        
-        template = """
+DEFAULT_HEADER = '[Your Name]\n[Your Email] | [Your Phone]\n[Your Address]'
+
+# Compiled once at import, rendered per document
+PROFESSIONAL_CV = compile_template("""
 {header}
 
 PROFESSIONAL SUMMARY
@@ -21,58 +21,9 @@ EDUCATION
 {education}
 
 {additional_sections}
-        """.strip()
-        
-        # Format header
-        header = cv_data.get('contact_info', '[Your Name]\n[Your Email] | [Your Phone]\n[Your Address]')
-        
-        # Format professional summary
-        professional_summary = cv_data.get('professional_summary', '')
-        
-        # Format key skills
-        skills = cv_data.get('key_skills', [])
-        if isinstance(skills, list):
-            key_skills = ' • '.join(skills)
-        else:
-            key_skills = skills
-        
-        # Format work experience
-        work_exp = cv_data.get('work_experience', [])
-        work_experience = ""
-        if isinstance(work_exp, list):
-            for exp in work_exp:
-                if isinstance(exp, dict):
-                    work_experience += f"""
-{exp.get('role', '')} | {exp.get('company', '')}
-{exp.get('duration', '')}
-{exp.get('achievements', '')}
-
-"""
-                else:
-                    work_experience += f"{exp}\n\n"
-        else:
-            work_experience = work_exp
-        
-        # Format education
-        education = cv_data.get('education', '')
-        
-        # Format additional sections
-        additional = cv_data.get('additional_sections', '')
-        
-        return template.format(
-            header=header,
-            professional_summary=professional_summary,
-            key_skills=key_skills,
-            work_experience=work_experience.strip(),
-            education=education,
-            additional_sections=additional
-        )
-    
-    @staticmethod
-    def format_modern_cv(cv_data: Dict) -> str:
-        """Format CV data into a modern template"""
-        
-        template = """
+""".strip())
+
+MODERN_CV = compile_template("""
 ═══════════════════════════════════════════════════════════════
 {header}
 ═══════════════════════════════════════════════════════════════
@@ -90,27 +41,24 @@ EDUCATION
 {education}
 
 {additional_sections}
-        """.strip()
-        
-        return CVTemplate._populate_template(template, cv_data)
-    
-    @staticmethod
-    def _populate_template(template: str, cv_data: Dict) -> str:
-        """Helper method to populate template with data"""
-        # Similar logic as format_professional_cv but with different styling
-        return template  # Implementation would be similar to above
+""".strip())
 
-class CoverLetterTemplate:
-    @staticmethod
-    def format_professional_cover_letter(
-        content: str,
-        company_name: str = "[Company Name]",
-        hiring_manager: str = "Hiring Manager",
-        applicant_name: str = "[Your Name]"
-    ) -> str:
-        """Format cover letter with professional template"""
-        
-        template = f"""
+# One work experience entry; entries are joined and the result stripped.
+PROFESSIONAL_EXPERIENCE_ENTRY = compile_template("""
+{role} | {company}
+{duration}
+{achievements}
+
+""")
+
+MODERN_EXPERIENCE_ENTRY = compile_template("""
+▸ {role} | {company}
+{duration}
+{achievements}
+
+""")
+
+PROFESSIONAL_COVER_LETTER = compile_template("""
 {applicant_name}
 [Your Address]
 [City, State ZIP Code]
@@ -129,20 +77,9 @@ Dear {hiring_manager},
 
 Sincerely,
 {applicant_name}
-        """.strip()
-        
-        return template
-    
-    @staticmethod
-    def format_modern_cover_letter(
-        content: str,
-        company_name: str = "[Company Name]",
-        hiring_manager: str = "Hiring Manager",
-        applicant_name: str = "[Your Name]"
-    ) -> str:
-        """Format cover letter with modern template"""
-        
-        template = f"""
+""".strip())
+
+MODERN_COVER_LETTER = compile_template("""
 ═══════════════════════════════════════════════════════════════
 
 {applicant_name} | [Your Email] | [Your Phone] | [Your LinkedIn]
@@ -160,6 +97,91 @@ Best regards,
 {applicant_name}
 
 ═══════════════════════════════════════════════════════════════
-        """.strip()
+""".strip())
+
+class CVTemplate:
+    @staticmethod
+    def format_professional_cv(cv_data: Union[Dict, ParsedCV]) -> str:
+        """Format CV data into a professional template"""
+        return CVTemplate._populate_template(PROFESSIONAL_CV, cv_data, PROFESSIONAL_EXPERIENCE_ENTRY)
+    
+    @staticmethod
+    def format_modern_cv(cv_data: Union[Dict, ParsedCV]) -> str:
+        """Format CV data into a modern template"""
+        return CVTemplate._populate_template(MODERN_CV, cv_data, MODERN_EXPERIENCE_ENTRY)
+    
+    @staticmethod
+    def _work_experience(work_exp, entry_template: CompiledTemplate) -> str:
+        """Work experience entries rendered and joined once"""
+        if not isinstance(work_exp, list):
+            return work_exp
+        
+        return ''.join(CVTemplate._experience_entry(exp, entry_template) for exp in work_exp)
+    
+    @staticmethod
+    def _experience_entry(exp, entry_template: CompiledTemplate) -> str:
+        if isinstance(exp, ExperienceEntry):
+            return entry_template.render({
+                'role': exp.role, 'company': exp.company,
+                'duration': exp.duration, 'achievements': exp.achievements
+            })
+        if isinstance(exp, dict):
+            # Fields an entry dict leaves out are shown empty
+            return entry_template.render({
+                'role': exp.get('role', ''), 'company': exp.get('company', ''),
+                'duration': exp.get('duration', ''), 'achievements': exp.get('achievements', '')
+            })
+        return f"{exp}\n\n"
+    
+    @staticmethod
+    def _populate_template(template: CompiledTemplate, cv_data: Union[Dict, ParsedCV],
+                           entry_template: CompiledTemplate) -> str:
+        """Helper method to populate template with data"""
+        if isinstance(cv_data, ParsedCV):
+            cv_data = cv_data.template_data()
+        
+        # Skills given as a list are shown on one line
+        skills = cv_data.get('key_skills', [])
+        key_skills = ' • '.join(skills) if isinstance(skills, list) else skills
+        
+        work_experience = CVTemplate._work_experience(cv_data.get('work_experience', []), entry_template)
         
-        return template
\ No newline at end of file
+        return template.render({
+            'header': cv_data.get('contact_info', DEFAULT_HEADER),
+            'professional_summary': cv_data.get('professional_summary', ''),
+            'key_skills': key_skills,
+            'work_experience': work_experience.strip(),
+            'education': cv_data.get('education', ''),
+            'additional_sections': cv_data.get('additional_sections', '')
+        })
+
+class CoverLetterTemplate:
+    @staticmethod
+    def format_professional_cover_letter(
+        content: str,
+        company_name: str = "[Company Name]",
+        hiring_manager: str = "Hiring Manager",
+        applicant_name: str = "[Your Name]"
+    ) -> str:
+        """Format cover letter with professional template"""
+        return PROFESSIONAL_COVER_LETTER.render({
+            'content': content,
+            'company_name': company_name,
+            'hiring_manager': hiring_manager,
+            'applicant_name': applicant_name
+        }).strip()
+    
+    @staticmethod
+    def format_modern_cover_letter(
+        content: str,
+        company_name: str = "[Company Name]",
+        hiring_manager: str = "Hiring Manager",
+        applicant_name: str = "[Your Name]"
+    ) -> str:
+        """Format cover letter with modern template"""
+        return MODERN_COVER_LETTER.render({
+            'content': content,
+            'company_name': company_name,
+            'hiring_manager': hiring_manager,
+            'applicant_name': applicant_name
+        }).strip()
@@ -0,0 +1,43 @@
+import string
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Tuple
+
+_formatter = string.Formatter()
+
+
+class CompiledTemplate:
+    """A ``{field}`` template parsed once into literal text and field parts.
+
+    Uses str.format syntax, with ``{{`` and ``}}`` for literal braces, but
+    only plain field names: no indexing, conversions or format specs.
+    Rendering walks the precompiled parts and joins them once, so the
+    template text is never re-parsed per document.
+    """
+
+    __slots__ = ('source', 'fields', '_parts')
+
+    def __init__(self, source: str):
+        parts: List[Tuple[str, Optional[str]]] = []  # (literal text, field after it or None)
+        for literal, field_name, format_spec, conversion in _formatter.parse(source):
+            if field_name is not None and (not field_name.isidentifier() or format_spec or conversion):
+                raise ValueError(f"Unsupported template field {{{field_name}}} in template")
+            parts.append((literal, field_name))
+
+        self.source = source
+        self.fields = tuple(dict.fromkeys(name for _, name in parts if name is not None))
+        self._parts = tuple(parts)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Fill every field from values; a missing one raises KeyError like str.format"""
+        parts = []
+        for literal, field_name in self._parts:
+            parts.append(literal)
+            if field_name is not None:
+                parts.append(str(values[field_name]))
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=64)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compiled template for source, compiled once per distinct template"""
+    return CompiledTemplate(source)
@@ -1,110 +1,67 @@
-from typing import Dict, List
+from typing import Dict, List, Union
+import pandas as pd
 import streamlit as st
-import re
-from collections import Counter
+from config.settings import settings
+from .cache import LRUCache, content_hash
+from .cv_model import ParsedCV
+from .keyword_extractor import keyword_extractor
+from .keyword_matrix import KeywordMatrix
+
+# Shared across sessions: keyword maps per document and full analyses per
+# (CV, job description) pair, both keyed by content hash
+_keyword_cache = LRUCache(settings.analytics_cache_size, settings.analytics_cache_ttl)
+_analysis_cache = LRUCache(settings.analytics_cache_size, settings.analytics_cache_ttl)
 
 class CVAnalytics:
     @staticmethod
-    def analyze_keyword_match(cv_content: str, job_description: str) -> Dict:
-        """Industry-agnostic keyword matching with enhanced technical term detection"""
-        
-        def extract_important_keywords(text: str) -> Dict[str, int]:
-            """Extract keywords with better technical term handling"""
-            text_lower = text.lower()
-            
-            # Remove common stop words
-            stop_words = {
-                'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
-                'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
-                'do', 'does', 'did', 'will', 'would', 'could', 'should', 'this', 'that',
-                'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'who', 'what',
-                'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more',
-                'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same',
-                'so', 'than', 'too', 'very', 'can', 'just', 'now', 'get', 'may', 'new',
-                'work', 'also', 'well', 'way', 'even', 'back', 'good', 'make', 'first',
-                'through', 'after', 'without', 'around', 'must', 'need', 'using', 'used',
-                'our', 'your', 'their', 'one', 'two', 'three', 'include', 'including'
-            }
-            
-            all_keywords = {}
-            
-            # 1. Extract important single words (including 2-letter important terms)
-            words = re.findall(r'\b[a-z]{2,}\b', text_lower)
-            important_single_words = [word for word in words if word not in stop_words]
-            
-            # 2. Extract specific technical abbreviations and short terms
-            tech_patterns = [
-                r'\bml\b', r'\bai\b', r'\bapi\b', r'\bsql\b', r'\baws\b', r'\bgcp\b',
-                r'\betl\b', r'\bci\b', r'\bcd\b', r'\bui\b', r'\bux\b', r'\bid\b',
-                r'\bkpi\b', r'\broi\b', r'\bcrm\b', r'\berp\b', r'\bseo\b', r'\bppc\b',
-                r'\bhr\b', r'\bpr\b', r'\bit\b', r'\bqa\b', r'\bba\b', r'\bpm\b'
-            ]
-            
-            for pattern in tech_patterns:
-                matches = re.findall(pattern, text_lower)
-                for match in matches:
-                    all_keywords[match] = all_keywords.get(match, 0) + 2  # Higher weight
-            
-            # 3. Extract compound terms and phrases
-            compound_patterns = [
-                r'machine\s+learning', r'deep\s+learning', r'data\s+science', r'data\s+analysis',
-                r'artificial\s+intelligence', r'computer\s+vision', r'natural\s+language',
-                r'project\s+management', r'product\s+management', r'customer\s+service',
-                r'business\s+intelligence', r'software\s+development', r'web\s+development',
-                r'quality\s+assurance', r'user\s+experience', r'digital\s+marketing',
-                r'financial\s+analysis', r'risk\s+management', r'supply\s+chain',
-                r'human\s+resources', r'sales\s+management', r'content\s+creation',
-                r'large\s+language\s+models?', r'language\s+models?', r'mlops', r'devops',
-                r'data\s+engineering', r'software\s+engineering', r'model\s+deployment',
-                r'feature\s+engineering', r'cross\s+functional', r'full\s+stack',
-                r'front\s+end', r'back\s+end', r'real\s+time', r'big\s+data'
-            ]
-            
-            for pattern in compound_patterns:
-                matches = re.findall(pattern, text_lower)
-                for match in matches:
-                    clean_match = re.sub(r'\s+', ' ', match.strip())
-                    all_keywords[clean_match] = all_keywords.get(clean_match, 0) + 3  # Even higher weight
-            
-            # 4. Extract acronyms (2-6 uppercase letters)
-            acronyms = re.findall(r'\b[A-Z]{2,6}\b', text)
-            for acronym in acronyms:
-                acronym_lower = acronym.lower()
-                all_keywords[acronym_lower] = all_keywords.get(acronym_lower, 0) + 2
-            
-            # 5. Special handling for LLMs and model terms
-            llm_patterns = [
-                r'\bllms?\b', r'\bgpt\b', r'\bbert\b', r'\btransformer\b', r'\bneural\s+network',
-                r'\bdeep\s+neural', r'\blanguage\s+model', r'\bgenerative\s+ai'
-            ]
-            
-            for pattern in llm_patterns:
-                matches = re.findall(pattern, text_lower)
-                for match in matches:
-                    clean_match = re.sub(r'\s+', ' ', match.strip())
-                    all_keywords[clean_match] = all_keywords.get(clean_match, 0) + 3
-            
-            # 6. Count regular words
-            word_counts = Counter(important_single_words)
-            for word, count in word_counts.items():
-                if word not in all_keywords:  # Don't overwrite higher-weighted terms
-                    all_keywords[word] = count
-            
-            # 7. Special handling for role-specific terms
-            role_terms = re.findall(r'\b(engineer|developer|analyst|manager|specialist|coordinator|director|lead|senior|junior|scientist|architect|consultant)\b', text_lower)
-            for term in role_terms:
-                all_keywords[term] = all_keywords.get(term, 0) + 1.5
-            
-            # 8. Technology and framework terms
-            tech_terms = re.findall(r'\b(python|java|javascript|react|angular|vue|node|docker|kubernetes|terraform|git|jenkins|jira|slack|excel|powerbi|tableau|salesforce|hubspot)\b', text_lower)
-            for term in tech_terms:
-                all_keywords[term] = all_keywords.get(term, 0) + 2
-            
-            return all_keywords
-        
-        # Extract keywords from both texts
-        cv_keywords = extract_important_keywords(cv_content)
-        job_keywords = extract_important_keywords(job_description)
+    def extract_important_keywords(text: str) -> Dict[str, float]:
+        """Extract keywords with better technical term handling"""
+        return keyword_extractor.extract(text)
+
+    @staticmethod
+    def _cached_keywords(text: str, text_hash: str) -> Dict[str, float]:
+        keywords = _keyword_cache.get(text_hash)
+        if keywords is None:
+            keywords = CVAnalytics.extract_important_keywords(text)
+            _keyword_cache.set(text_hash, keywords)
+        return keywords
+
+    @staticmethod
+    def _cv_hash(cv: Union[str, ParsedCV]) -> str:
+        return cv.digest if isinstance(cv, ParsedCV) else content_hash(cv)
+
+    @staticmethod
+    def _cv_keywords(cv: Union[str, ParsedCV], cv_hash: str) -> Dict[str, float]:
+        """Keywords of a CV, kept on the ParsedCV once extracted"""
+        if not isinstance(cv, ParsedCV):
+            return CVAnalytics._cached_keywords(cv, cv_hash)
+        if cv.keywords is None:
+            cv.keywords = CVAnalytics._cached_keywords(cv.text, cv_hash)
+        return cv.keywords
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Dict]:
+        """Hit/miss counters of the keyword and analysis caches"""
+        return {
+            "documents": _keyword_cache.stats(),
+            "analyses": _analysis_cache.stats()
+        }
+
+    @staticmethod
+    def analyze_keyword_match(cv_content: Union[str, ParsedCV], job_description: str) -> Dict:
+        """Industry-agnostic keyword matching with enhanced technical term detection.
+
+        Results are cached by content hash and shared, so treat them as read-only.
+        """
+        cv_hash = CVAnalytics._cv_hash(cv_content)
+        job_hash = content_hash(job_description)
+        cached = _analysis_cache.get((cv_hash, job_hash))
+        if cached is not None:
+            return cached
+        
+        # Extract keywords from both texts, reusing either side if unchanged
+        cv_keywords = CVAnalytics._cv_keywords(cv_content, cv_hash)
+        job_keywords = CVAnalytics._cached_keywords(job_description, job_hash)
         
         # Find matches and calculate weighted scores
         matching_keywords = {}
@@ -127,8 +84,9 @@ class CVAnalytics:
         # Sort by importance (frequency in job description)
         top_matching = sorted(matching_keywords.items(), key=lambda x: x[1], reverse=True)
         top_missing = sorted(missing_keywords.items(), key=lambda x: x[1], reverse=True)
+        top_job = sorted(job_keywords.items(), key=lambda x: x[1], reverse=True)
         
-        return {
+        analysis = {
             "match_percentage": round(match_percentage, 2),
             "matching_keywords": [keyword for keyword, freq in top_matching[:15]],
             "missing_keywords": [keyword for keyword, freq in top_missing[:15]],
@@ -136,11 +94,76 @@ class CVAnalytics:
             "cv_keyword_count": len(cv_keywords),
             "job_keyword_count": len(job_keywords),
             "cv_keywords_detail": cv_keywords,
-            "job_keywords_detail": job_keywords
+            "job_keywords_detail": job_keywords,
+            # Precomputed for the dashboard so reruns don't sort again
+            "top_matching_detail": top_matching[:15],
+            "top_job_keywords": [
+                (keyword, weight, keyword in matching_keywords) for keyword, weight in top_job[:20]
+            ]
         }
+        _analysis_cache.set((cv_hash, job_hash), analysis)
+        return analysis
+    
+    @staticmethod
+    def batch_keyword_match(cv_content: Union[str, ParsedCV], job_descriptions: List[str]) -> List[Dict]:
+        """
+        Score one CV against many job descriptions at once.
+
+        Returns, per job description and in the same order, the
+        match_percentage, missing_keywords and high_priority_missing that
+        analyze_keyword_match would give, computed on a sparse keyword matrix.
+        """
+        cv_keywords = CVAnalytics._cv_keywords(cv_content, CVAnalytics._cv_hash(cv_content))
+        # Reuse cached job keywords but don't store new ones, a large corpus
+        # would only evict the entries the dashboard relies on. Peeking keeps
+        # the corpus out of the dashboard's hit/miss counters too.
+        job_keywords = []
+        for job_description in job_descriptions:
+            keywords = _keyword_cache.peek(content_hash(job_description))
+            if keywords is None:
+                keywords = CVAnalytics.extract_important_keywords(job_description)
+            job_keywords.append(keywords)
+        job_matrix = KeywordMatrix(job_keywords)
+        present = job_matrix.presence(cv_keywords)
+        
+        percentages = job_matrix.match_percentages(present)
+        missing = job_matrix.top_missing(present, 15)
+        return [
+            {
+                "match_percentage": float(percentage),
+                "missing_keywords": top_missing,
+                "high_priority_missing": top_missing[:5]
+            }
+            for percentage, top_missing in zip(percentages, missing)
+        ]
+    
+    @staticmethod
+    def _keyword_frame(keywords: List) -> pd.DataFrame:
+        """Ranked (keyword, weight) pairs as a table"""
+        return pd.DataFrame(
+            [(rank, keyword, weight) for rank, (keyword, weight) in enumerate(keywords, 1)],
+            columns=["#", "Keyword", "Weight"]
+        )
     
     @staticmethod
-    def display_analytics_dashboard(cv_content: str, job_description: str):
+    def _missing_keywords_markdown(analysis: Dict) -> str:
+        """Both missing-keyword lists as a single markdown block"""
+        lines = ["**🔥 HIGH PRIORITY Missing:**", ""]
+        if analysis['high_priority_missing']:
+            lines += [f"- **{keyword}**" for keyword in analysis['high_priority_missing']]
+        else:
+            lines.append("No high priority missing keywords!")
+        
+        lines += ["", "**❌ Other Missing Keywords:**", ""]
+        other_missing = analysis['missing_keywords'][5:10]  # Next 5
+        if other_missing:
+            lines += [f"- {keyword}" for keyword in other_missing]
+        else:
+            lines.append("No other missing keywords")
+        return "\n".join(lines)
+    
+    @staticmethod
+    def display_analytics_dashboard(cv_content: Union[str, ParsedCV], job_description: str):
         """Industry-agnostic analytics dashboard"""
         
         st.markdown("### 📊 CV Analytics Dashboard")
@@ -172,14 +195,17 @@ class CVAnalytics:
         elif analysis['match_percentage'] >= 80:
             st.success("🎉 Excellent keyword match! Your CV is well-optimized for this job.")
         
-        # Detailed breakdown
+        # Detailed breakdown, one element per list
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("**✅ Matching Keywords:**")
-            if analysis['matching_keywords']:
-                for i, keyword in enumerate(analysis['matching_keywords'], 1):
-                    st.write(f"{i}. **{keyword}**")
+            if analysis['top_matching_detail']:
+                st.dataframe(
+                    CVAnalytics._keyword_frame(analysis['top_matching_detail']),
+                    hide_index=True,
+                    use_container_width=True
+                )
             else:
                 st.write("No matching keywords found")
             
@@ -187,20 +213,7 @@ class CVAnalytics:
             st.caption(f"Total CV keywords detected: {analysis['cv_keyword_count']}")
         
         with col2:
-            st.markdown("**🔥 HIGH PRIORITY Missing:**")
-            if analysis['high_priority_missing']:
-                for keyword in analysis['high_priority_missing']:
-                    st.write(f"• **{keyword}**")
-            else:
-                st.write("No high priority missing keywords!")
-            
-            st.markdown("**❌ Other Missing Keywords:**")
-            other_missing = analysis['missing_keywords'][5:10]  # Next 5
-            if other_missing:
-                for keyword in other_missing:
-                    st.write(f"• {keyword}")
-            else:
-                st.write("No other missing keywords")
+            st.markdown(CVAnalytics._missing_keywords_markdown(analysis))
             
             # Show total job keywords
             st.caption(f"Total job keywords detected: {analysis['job_keyword_count']}")
@@ -208,14 +221,15 @@ class CVAnalytics:
         # Expandable detailed analysis
         with st.expander("🔍 Detailed Keyword Analysis"):
             st.markdown("**All Job Description Keywords (by importance):**")
-            job_details = analysis.get('job_keywords_detail', {})
-            sorted_job_keywords = sorted(job_details.items(), key=lambda x: x[1], reverse=True)
-            
-            for keyword, weight in sorted_job_keywords[:20]:
-                if keyword in analysis['matching_keywords']:
-                    st.write(f"✅ **{keyword}** (weight: {weight})")
-                else:
-                    st.write(f"❌ {keyword} (weight: {weight})")
+            st.dataframe(
+                pd.DataFrame(
+                    [(keyword, weight, "✅" if matched else "❌")
+                     for keyword, weight, matched in analysis['top_job_keywords']],
+                    columns=["Keyword", "Weight", "In CV"]
+                ),
+                hide_index=True,
+                use_container_width=True
+            )
         
         # Recommendations
         if analysis['high_priority_missing']:
@@ -226,4 +240,11 @@ class CVAnalytics:
             2. Include specific examples using these keywords
             3. Update your skills section with missing technical terms
             4. Rewrite achievements to include relevant terminology
-            """)
\ No newline at end of file
+            """)
+        
+        if settings.debug:
+            stats = CVAnalytics.cache_stats()
+            st.caption(
+                f"Analysis cache: {stats['analyses']['hits']} hits / {stats['analyses']['misses']} misses | "
+                f"Document cache: {stats['documents']['hits']} hits / {stats['documents']['misses']} misses"
+            )
\ No newline at end of file
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def content_hash(content) -> str:
+    """Stable SHA-256 hex digest of text or bytes, used as a cache key"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with optional per-entry TTL and hit/miss counters.
+
+    Streamlit serves every session from the same process, so instances are
+    usually module-level and shared across sessions and reruns.
+
+    With ``max_bytes`` set, the cache is also bounded by memory: ``sizeof``
+    measures each value (``len`` by default) and least-recently-used entries
+    are evicted until the total fits. Values larger than ``max_bytes`` are
+    not stored at all.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, sizeof: Callable[[Any], int] = len):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Like get, but neither counted as a hit or miss nor marked as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    return value
+            return default
+
+    def _remove(self, key: Hashable):
+        self._bytes -= self._entries.pop(key)[2]
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0
+            }
@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Union
+
+
+def slotted(cls):
+    """
+    Give a dataclass __slots__, like dataclass(slots=True) on Python 3.10+.
+    Instances then have no per-object __dict__, which makes them about a
+    third smaller and rejects misspelt attribute names.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = names
+    # Class-level defaults would shadow the slot descriptors; __init__ keeps its own copy
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+@slotted
+@dataclass
+class Contact:
+    name: str = ""
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+
+    def header(self) -> str:
+        """Name over the contact line, as the templates print it"""
+        details = ' | '.join(value for value in (self.email, self.phone, self.location) if value)
+        return '\n'.join(value for value in (self.name, details) if value)
+
+
+@slotted
+@dataclass
+class ExperienceEntry:
+    role: str = ""
+    company: str = ""
+    duration: str = ""
+    achievements: str = ""
+
+
+@slotted
+@dataclass
+class Skills:
+    summary: str = ""  # the skills heading line and the lines after it
+    items: List[str] = field(default_factory=list)
+
+
+@slotted
+@dataclass
+class Education:
+    summary: str = ""  # first line mentioning a degree or institution
+    entries: List[str] = field(default_factory=list)  # lines of the education section
+
+
+@slotted
+@dataclass
+class ParsedCV:
+    """A CV parsed once per upload and shared by everything that reads it.
+
+    ``text`` is the CV as uploaded and ``digest`` its content hash, which
+    analytics reuses as its cache key. ``keywords`` is filled in by the
+    first keyword analysis.
+    """
+    text: str
+    digest: str
+    contact: Contact = field(default_factory=Contact)
+    skills: Skills = field(default_factory=Skills)
+    education: Education = field(default_factory=Education)
+    experience: List[ExperienceEntry] = field(default_factory=list)
+    experience_years: str = ""
+    keywords: Optional[Dict[str, float]] = None
+
+    @property
+    def word_count(self) -> int:
+        # Splitting a long CV costs more than the rest of parsing, so only on demand
+        return len(self.text.split())
+
+    def template_data(self) -> Dict[str, Any]:
+        """The cv_data dict the CV templates take, leaving out what wasn't found"""
+        data = {
+            'contact_info': self.contact.header(),
+            'key_skills': self.skills.items,
+            'work_experience': self.experience,
+            'education': '\n'.join(self.education.entries) or self.education.summary
+        }
+        return {key: value for key, value in data.items() if value}
+
+
+def cv_text(cv: Union[str, ParsedCV]) -> str:
+    """Raw text of a CV given either as text or parsed"""
+    return cv.text if isinstance(cv, ParsedCV) else cv
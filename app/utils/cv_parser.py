@@ -0,0 +1,265 @@
+import re
+from typing import List, Optional, Tuple
+from .cache import LRUCache, content_hash
+from .cv_model import Contact, Education, ExperienceEntry, ParsedCV, Skills
+
+# Lines mentioning a location, checked in this order of preference
+LOCATION_KEYWORDS = ('istanbul', 'ankara', 'izmir', 'turkey', 'turkiye', 'usa', 'uk', 'germany')
+# A line mentioning one of these starts the skills section
+SKILL_INDICATORS = ('skill', 'technical', 'programming', 'software', 'tools', 'technologies')
+EDUCATION_KEYWORDS = ('university', 'college', 'degree', 'bachelor', 'master', 'phd', 'education')
+# Heading words that rule a line out as the candidate's name
+TITLE_WORDS = ('cv', 'resume', 'curriculum', 'vitae')
+
+# Section headings that start the work history
+EXPERIENCE_HEADINGS = ('experience', 'employment', 'work history', 'career history')
+# Lines that are headings even without heading markup
+SECTION_NAMES = frozenset({
+    'summary', 'professional summary', 'profile', 'about me', 'contact', 'contact information',
+    'experience', 'work experience', 'professional experience', 'employment', 'employment history',
+    'work history', 'career history', 'education', 'skills', 'technical skills', 'key skills',
+    'core competencies', 'projects', 'certifications', 'languages', 'awards', 'publications',
+    'volunteering', 'interests', 'hobbies', 'references'
+})
+
+NAME_SEARCH_LINES = 5
+SKILLS_LINES = 5
+# Longest line still taken for a section heading, in words
+MAX_HEADING_WORDS = 5
+
+
+class CVParser:
+    """Structured fields of a plain-text CV.
+
+    The text is lowercased once and never split as a whole. Each keyword is
+    located with one substring search over the full text, which runs in C
+    and beats both a per-line scan and a regex alternation of the keywords,
+    and only the lines a field needs are cut out: the line of the most
+    preferred location keyword, and the earliest line with a skills or
+    education keyword. Email and phone come from precompiled patterns,
+    years of experience from a pattern tried only where "year" occurs.
+    Fields that aren't found are empty strings.
+    """
+
+    _email_re = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+    # Tried in order, the first pattern with any match wins
+    _phone_res = (
+        re.compile(r'\+?[\d\s\-\(\)]{10,}'),
+        re.compile(r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b'),
+        re.compile(r'\b\d{2,4}[-.\s]?\d{3}[-.\s]?\d{3,4}\b')
+    )
+    # Matched at the start of a number found to the left of "year"
+    _experience_re = re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)')
+    _title_re = re.compile('|'.join(TITLE_WORDS))
+    _name_excluded_chars = frozenset('@+.')
+
+    @staticmethod
+    def _first(lowered: str, keywords: Tuple[str, ...]) -> int:
+        """Earliest position of any of the keywords, -1 if none occurs"""
+        first = -1
+        for keyword in keywords:
+            # Once one is found, the others only need searching up to it
+            end = len(lowered) if first == -1 else first + len(keyword)
+            position = lowered.find(keyword, 0, end)
+            if position != -1 and (first == -1 or position < first):
+                first = position
+        return first
+
+    @staticmethod
+    def _line(text: str, lowered: str, position: int, count: int = 1) -> List[str]:
+        """`count` lines of text starting with the one at `position` in lowered"""
+        if len(lowered) == len(text):
+            start = lowered.rfind('\n', 0, position) + 1
+        else:
+            # Lowercasing changed the length (e.g. "İ"), go by line number instead
+            line_number = lowered.count('\n', 0, position)
+            start = 0
+            for _ in range(line_number):
+                start = text.index('\n', start) + 1
+        return text[start:].split('\n', count)[:count]
+
+    def _name(self, text: str) -> str:
+        """First short line near the top without contact details or a CV heading"""
+        for line in text.strip().split('\n', NAME_SEARCH_LINES)[:NAME_SEARCH_LINES]:
+            line = line.strip()
+            if (line and len(line.split()) <= 4 and self._name_excluded_chars.isdisjoint(line)
+                    and not self._title_re.search(line.lower())):
+                return line
+        return ""
+
+    def _phone(self, text: str) -> str:
+        for pattern in self._phone_res:
+            match = pattern.search(text)
+            if match:
+                return match.group().strip()
+        return ""
+
+    def _experience_years(self, lowered: str) -> str:
+        """Years from the first "<n>+ years of experience", anchored on each "year" """
+        year = lowered.find('year')
+        while year != -1:
+            # Walk back over whitespace, an optional "+" and the digits of the number
+            start = year
+            while start and lowered[start - 1].isspace():
+                start -= 1
+            if start and lowered[start - 1] == '+':
+                start -= 1
+            digits_end = start
+            while start and lowered[start - 1].isdecimal():
+                start -= 1
+            if start < digits_end:
+                match = self._experience_re.match(lowered, start)
+                if match:
+                    return f"{match.group(1)} years"
+            year = lowered.find('year', year + 4)
+        return ""
+
+    _HEADING_MARKUP_RE = re.compile(r'^[#*\s]+|[*:\s]+$')
+
+    @staticmethod
+    def _is_heading(line: str) -> bool:
+        stripped = line.strip()
+        if not stripped or len(stripped.split()) > MAX_HEADING_WORDS:
+            return False
+        return (stripped.endswith(':') or stripped.startswith(('#', '**'))
+                or (stripped.isupper() and any(char.isalpha() for char in stripped))
+                or CVParser._HEADING_MARKUP_RE.sub('', stripped).lower() in SECTION_NAMES)
+
+    def _section(self, text: str, lowered: str, headings: Tuple[str, ...]) -> Optional[List[str]]:
+        """Lines under the first heading line mentioning one of headings, up to the next heading"""
+        if len(lowered) != len(text):
+            # Offsets in lowered don't carry over (e.g. "İ"); rare enough to go without sections
+            return None
+        start = -1
+        for heading in headings:
+            position = lowered.find(heading)
+            while position != -1 and (start == -1 or position < start):
+                line_start = lowered.rfind('\n', 0, position) + 1
+                line_end = lowered.find('\n', position)
+                line_end = len(lowered) if line_end == -1 else line_end
+                if self._is_heading(text[line_start:line_end]):
+                    start = line_end + 1
+                    break
+                position = lowered.find(heading, line_end)
+        if start == -1:
+            return None
+
+        # Walk the section line by line, the rest of the text is never split
+        lines: List[str] = []
+        while start < len(text):
+            end = text.find('\n', start)
+            end = len(text) if end == -1 else end
+            line = text[start:end]
+            if self._is_heading(line):
+                break
+            lines.append(line.rstrip())
+            start = end + 1
+        return lines
+
+    _ROLE_SEPARATORS = (' | ', ' at ', ' @ ', ' — ', ' – ', ' - ', ', ')
+    _DATE_RE = re.compile(r'\b(?:19|20)\d{2}\b|\bpresent\b|\bcurrent\b', re.IGNORECASE)
+    _BULLET_RE = re.compile(r'^[-*•·]\s*')
+    _SKILL_SPLIT_RE = re.compile(r'\s*[,;|•·]\s*')
+
+    def _experience_entry(self, block: List[str]) -> ExperienceEntry:
+        """One blank-line separated block of the experience section"""
+        title = block[0].strip()
+        rest = block[1:]
+        duration = ""
+        if rest and self._DATE_RE.search(rest[0]):
+            duration = rest[0].strip()
+            rest = rest[1:]
+        else:
+            # "Role | Company | 2020 - Present" or "Role at Company | 2020 - Present" on one line
+            parts = [part.strip() for part in title.split(' | ')]
+            if len(parts) > 1 and self._DATE_RE.search(parts[-1]):
+                duration = parts.pop()
+                title = ' | '.join(parts)
+
+        role, company = title, ""
+        for separator in self._ROLE_SEPARATORS:
+            if separator in title:
+                role, company = (part.strip() for part in title.split(separator, 1))
+                break
+        return ExperienceEntry(role, company, duration, '\n'.join(line.strip() for line in rest))
+
+    def _experience(self, text: str, lowered: str) -> List[ExperienceEntry]:
+        lines = self._section(text, lowered, EXPERIENCE_HEADINGS) or []
+        entries: List[ExperienceEntry] = []
+        block: List[str] = []
+        for line in lines + [""]:
+            if line.strip():
+                block.append(line)
+            elif block:
+                entries.append(self._experience_entry(block))
+                block = []
+        return entries
+
+    def _skill_items(self, skills_lines: List[str]) -> List[str]:
+        """Individual skills from the lines after the skills heading"""
+        items: List[str] = []
+        for line in skills_lines[1:]:
+            if self._is_heading(line):
+                break
+            line = self._BULLET_RE.sub('', line.strip())
+            if ':' in line:
+                # "Languages: Python, SQL"
+                line = line.split(':', 1)[1]
+            items.extend(item for item in self._SKILL_SPLIT_RE.split(line) if item)
+        return list(dict.fromkeys(items))
+
+    def parse(self, text: str, digest: str = None) -> ParsedCV:
+        """Parse contact details, skills, education and work experience"""
+        lowered = text.lower()
+
+        location = ""
+        for keyword in LOCATION_KEYWORDS:
+            position = lowered.find(keyword)
+            if position != -1:
+                location = self._line(text, lowered, position)[0].strip()
+                break
+
+        skills_lines: List[str] = []
+        position = self._first(lowered, SKILL_INDICATORS)
+        if position != -1:
+            skills_lines = [line.strip() for line in self._line(text, lowered, position, SKILLS_LINES) if line.strip()]
+
+        education = ""
+        position = self._first(lowered, EDUCATION_KEYWORDS)
+        if position != -1:
+            education = self._line(text, lowered, position)[0].strip()
+        education_entries = [line.strip() for line in self._section(text, lowered, ('education',)) or [] if line.strip()]
+
+        email_match = self._email_re.search(text)
+        return ParsedCV(
+            text=text,
+            digest=digest or content_hash(text),
+            contact=Contact(
+                name=self._name(text),
+                email=email_match.group() if email_match else "",
+                phone=self._phone(text),
+                location=location
+            ),
+            skills=Skills(' | '.join(skills_lines), self._skill_items(skills_lines)),
+            education=Education(education, education_entries),
+            experience=self._experience(text, lowered),
+            experience_years=self._experience_years(lowered)
+        )
+
+
+# Compiled once, shared by every caller
+cv_parser = CVParser()
+
+# Parsed CVs by content hash, so an upload is parsed once however many
+# places read it
+_parsed_cache = LRUCache(64)
+
+
+def parse_cv(text: str) -> ParsedCV:
+    """The shared ParsedCV for this text, parsed on first use"""
+    digest = content_hash(text)
+    parsed = _parsed_cache.get(digest)
+    if parsed is None:
+        parsed = cv_parser.parse(text, digest)
+        _parsed_cache.set(digest, parsed)
+    return parsed
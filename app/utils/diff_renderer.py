@@ -0,0 +1,149 @@
+import difflib
+import html
+import re
+from typing import List, Tuple
+from config.settings import settings
+from .cache import LRUCache, content_hash
+
+# Rendered diffs keyed by both texts and the render options, reused across reruns
+_diff_cache = LRUCache(32, max_bytes=8 * 1024 * 1024, sizeof=lambda text: len(text.encode('utf-8')))
+
+class DiffRenderer:
+    """Line diff of two documents rendered as a single HTML block.
+
+    Lines are matched with difflib's SequenceMatcher, so an inserted or
+    removed line only affects itself. Unchanged runs longer than the context
+    are collapsed, changed line pairs get word-level highlighting, and the
+    output is capped at ``max_lines`` rendered lines.
+    """
+
+    REMOVED_STYLE = "background-color: #ffebe9; color: #82071e;"
+    ADDED_STYLE = "background-color: #e6ffec; color: #116329;"
+    WORD_REMOVED_STYLE = "background-color: #ffc1c0; text-decoration: line-through;"
+    WORD_ADDED_STYLE = "background-color: #abf2bc;"
+    COLLAPSED_STYLE = "color: #888; font-style: italic;"
+
+    # Word-level diffs are quadratic in the worst case, skip them for very long lines
+    MAX_WORD_DIFF_CHARS = 2000
+
+    _TOKEN_RE = re.compile(r'\s+|\w+|[^\w\s]')
+
+    @staticmethod
+    def _count(n: int, noun: str) -> str:
+        return f"{n} {noun}" + ("" if n == 1 else "s")
+
+    @staticmethod
+    def _line(prefix: str, body: str, style: str = "") -> str:
+        return f'<div style="{style}">{prefix} {body}</div>'
+
+    @staticmethod
+    def _word_diff(original: str, generated: str) -> Tuple[str, str]:
+        """HTML for a changed line pair with the differing words highlighted"""
+        if len(original) + len(generated) > DiffRenderer.MAX_WORD_DIFF_CHARS:
+            return html.escape(original), html.escape(generated)
+
+        old_tokens = DiffRenderer._TOKEN_RE.findall(original)
+        new_tokens = DiffRenderer._TOKEN_RE.findall(generated)
+        old_parts: List[str] = []
+        new_parts: List[str] = []
+        matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            old_text = html.escape(''.join(old_tokens[i1:i2]))
+            new_text = html.escape(''.join(new_tokens[j1:j2]))
+            if tag == 'equal':
+                old_parts.append(old_text)
+                new_parts.append(new_text)
+                continue
+            if old_text:
+                old_parts.append(f'<span style="{DiffRenderer.WORD_REMOVED_STYLE}">{old_text}</span>')
+            if new_text:
+                new_parts.append(f'<span style="{DiffRenderer.WORD_ADDED_STYLE}">{new_text}</span>')
+        return ''.join(old_parts), ''.join(new_parts)
+
+    @staticmethod
+    def render_html(original: str, generated: str, style: str = "", context: int = 2,
+                    max_lines: int = None) -> str:
+        """
+        Diff original against generated and return one HTML block.
+        Unchanged runs beyond `context` lines around a change are collapsed.
+        """
+        max_lines = max_lines if max_lines is not None else settings.diff_max_lines
+        cache_key = (content_hash(original), content_hash(generated), style, context, max_lines)
+        rendered = _diff_cache.get(cache_key)
+        if rendered is None:
+            rendered = DiffRenderer._render(original, generated, style, context, max_lines)
+            _diff_cache.set(cache_key, rendered)
+        return rendered
+
+    @staticmethod
+    def _render(original: str, generated: str, style: str, context: int, max_lines: int) -> str:
+        original_lines = original.split('\n')
+        generated_lines = generated.split('\n')
+        if original_lines == generated_lines:
+            return f'<div style="{style} {DiffRenderer.COLLAPSED_STYLE}">No changes</div>'
+        matcher = difflib.SequenceMatcher(None, original_lines, generated_lines, autojunk=False)
+
+        parts: List[str] = []
+        added = removed = 0
+        truncated = False
+        last_end = 0
+
+        def emit(line: str):
+            nonlocal truncated
+            if len(parts) >= max_lines:
+                truncated = True
+            else:
+                parts.append(line)
+
+        for group in matcher.get_grouped_opcodes(context):
+            if truncated:
+                break
+            skipped = group[0][1] - last_end
+            if skipped > 0:
+                emit(DiffRenderer._line("⋯", DiffRenderer._count(skipped, "unchanged line"), DiffRenderer.COLLAPSED_STYLE))
+            last_end = group[-1][2]
+
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    for line in original_lines[i1:i2]:
+                        emit(DiffRenderer._line("&nbsp;", html.escape(line)))
+                    continue
+
+                removed += i2 - i1
+                added += j2 - j1
+                old_block = original_lines[i1:i2]
+                new_block = generated_lines[j1:j2]
+                if tag == 'replace':
+                    # Pair lines up for word-level highlighting, leftovers are whole-line changes
+                    pairs = min(len(old_block), len(new_block))
+                    old_html, new_html = [], []
+                    for old_line, new_line in zip(old_block[:pairs], new_block[:pairs]):
+                        old_words, new_words = DiffRenderer._word_diff(old_line, new_line)
+                        old_html.append(old_words)
+                        new_html.append(new_words)
+                    old_html += [html.escape(line) for line in old_block[pairs:]]
+                    new_html += [html.escape(line) for line in new_block[pairs:]]
+                else:
+                    old_html = [html.escape(line) for line in old_block]
+                    new_html = [html.escape(line) for line in new_block]
+
+                for line in old_html:
+                    emit(DiffRenderer._line("-", line, DiffRenderer.REMOVED_STYLE))
+                for line in new_html:
+                    emit(DiffRenderer._line("+", line, DiffRenderer.ADDED_STYLE))
+
+        if not truncated and last_end < len(original_lines):
+            emit(DiffRenderer._line("⋯", DiffRenderer._count(len(original_lines) - last_end, "unchanged line"),
+                                    DiffRenderer.COLLAPSED_STYLE))
+
+        if truncated:
+            summary = f"Showing the first {max_lines} lines of the diff"
+        else:
+            summary = f"{DiffRenderer._count(added, 'line')} added, {DiffRenderer._count(removed, 'line')} removed"
+
+        return (
+            f'<div style="{style} white-space: pre-wrap; font-family: monospace;">'
+            f'<div style="{DiffRenderer.COLLAPSED_STYLE}">{summary}</div>'
+            + ''.join(parts) +
+            '</div>'
+        )
@@ -1,51 +1,212 @@
 import PyPDF2
 from docx import Document
 import streamlit as st
-from typing import Optional
+from io import BytesIO
+from typing import Dict, Iterator, List, Optional, Tuple
+from config.settings import settings
+from .cache import LRUCache, content_hash
+import atexit
+import logging
+import multiprocessing
 import tempfile
+import threading
 import os
+import time
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """Worker: parse the PDF and extract text from pages [start, stop)"""
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+class _PagePool:
+    """Long-lived worker processes for page extraction, shared by all sessions.
+
+    Workers are spawned rather than forked, the Streamlit server being
+    multi-threaded, and started on first use. Extractions acquire the pool
+    and release it when done. One that overran the time limit retires the
+    pool, so later extractions start a fresh one, but the retired pool is
+    only terminated once no other extraction is still using it; its
+    runaway workers never cut short another session's pages.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._users: Dict["multiprocessing.pool.Pool", int] = {}  # pool -> extractions using it
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def acquire(self) -> "multiprocessing.pool.Pool":
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.get_context("spawn").Pool(settings.pdf_workers)
+            self._users[self._pool] = self._users.get(self._pool, 0) + 1
+            return self._pool
+
+    def release(self, pool: "multiprocessing.pool.Pool", overran: bool = False):
+        """Done with pool; overran retires it, a retired pool is terminated by its last user"""
+        with self._lock:
+            self._users[pool] -= 1
+            if overran and self._pool is pool:
+                self._pool = None
+            terminate = self._pool is not pool and self._users[pool] == 0
+            if terminate:
+                del self._users[pool]
+        if terminate:
+            pool.terminate()
+
+    def close(self):
+        with self._lock:
+            pools = set(self._users)
+            if self._pool is not None:
+                pools.add(self._pool)
+            self._pool = None
+            self._users.clear()
+        for pool in pools:
+            pool.terminate()
+
+_page_pool = _PagePool()
+
+# (extracted text, warning shown with it) keyed by file type and content
+# hash, shared across sessions and reruns. Bounded by the UTF-8 size of the
+# cached text.
+_extraction_cache = LRUCache(
+    settings.upload_cache_size,
+    max_bytes=settings.upload_cache_max_bytes,
+    sizeof=lambda entry: len(entry[0].encode('utf-8'))
+)
 
 class FileHandler:
     @staticmethod
-    def extract_text_from_pdf(file) -> str:
+    def _read_bytes(file) -> bytes:
+        if isinstance(file, bytes):
+            return file
+        if hasattr(file, 'getvalue'):
+            return file.getvalue()
+        file.seek(0)
+        return file.read()
+    
+    @staticmethod
+    def iter_pdf_pages(file, max_pages: Optional[int] = None, time_limit: Optional[float] = None) -> Iterator[str]:
+        """Yield the text of each page, stopping at max_pages or after time_limit seconds"""
+        pdf_reader = PyPDF2.PdfReader(file)
+        deadline = time.monotonic() + time_limit if time_limit else None
+        for i, page in enumerate(pdf_reader.pages):
+            if max_pages is not None and i >= max_pages:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                logging.warning(f"PDF extraction stopped after {i} pages (time limit)")
+                break
+            yield page.extract_text()
+    
+    @staticmethod
+    def _extract_pages_parallel(data: bytes, page_count: int, time_limit: float) -> List[str]:
+        """Extract pages in the worker pool, one contiguous page range per worker"""
+        workers = min(settings.pdf_workers, page_count)
+        chunk = -(-page_count // workers)
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        
+        pool = _page_pool.acquire()
+        overran = False
         try:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            results = [pool.apply_async(_extract_page_range, (data, start, stop)) for start, stop in ranges]
+            deadline = time.monotonic() + time_limit
+            
+            # Keep pages in order, up to the first range that didn't finish in time
+            pages = []
+            for result in results:
+                result.wait(max(0.0, deadline - time.monotonic()))
+                if not result.ready():
+                    logging.warning(f"PDF extraction stopped after {len(pages)} pages (time limit)")
+                    overran = True
+                    break
+                pages.extend(result.get())
+            return pages
+        finally:
+            _page_pool.release(pool, overran)
+    
+    @staticmethod
+    def _extract_pdf(data: bytes) -> Tuple[str, Optional[str], bool]:
+        """
+        Text of a PDF, the warning to show with it, and whether it is
+        complete: False when the time limit cut it short, which a later try
+        may not. Truncation at the page limit is always the same, so it
+        counts as complete and only comes with a warning.
+        """
+        try:
+            total_pages = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+            page_count = min(total_pages, settings.pdf_max_pages)
+            
+            if settings.pdf_workers > 1 and page_count >= settings.pdf_parallel_min_pages:
+                pages = FileHandler._extract_pages_parallel(data, page_count, settings.pdf_time_limit)
+            else:
+                pages = list(FileHandler.iter_pdf_pages(BytesIO(data), page_count, settings.pdf_time_limit))
+            
+            text = "\n".join(pages).strip()
+            if len(pages) < page_count:
+                return text, f"Only the first {len(pages)} of {total_pages} pages could be read in time.", False
+            if page_count < total_pages:
+                return text, (f"Only the first {page_count} of {total_pages} pages were read "
+                              f"(the limit is {settings.pdf_max_pages} pages)."), True
+            return text, None, True
         except Exception as e:
             st.error(f"Error reading PDF: {str(e)}")
-            return ""
+            return "", None, False
+    
+    @staticmethod
+    def extract_text_from_pdf(file) -> str:
+        text, warning, _ = FileHandler._extract_pdf(FileHandler._read_bytes(file))
+        if warning:
+            st.warning(warning)
+        return text
     
     @staticmethod
     def extract_text_from_docx(file) -> str:
         try:
             doc = Document(file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
         except Exception as e:
             st.error(f"Error reading DOCX: {str(e)}")
             return ""
     
+    @staticmethod
+    def file_digest(uploaded_file) -> str:
+        """Content hash of an uploaded file, stable across Streamlit reruns"""
+        return content_hash(FileHandler._read_bytes(uploaded_file))
+    
     @staticmethod
     def extract_text_from_file(uploaded_file) -> Optional[str]:
         if uploaded_file is None:
             return None
         
         file_extension = uploaded_file.name.split('.')[-1].lower()
+        if file_extension not in ['pdf', 'docx', 'doc', 'txt']:
+            st.error("Unsupported file format. Please upload PDF, DOCX, or TXT files.")
+            return None
         
+        data = FileHandler._read_bytes(uploaded_file)
+        cache_key = (file_extension, content_hash(data))
+        cached = _extraction_cache.get(cache_key)
+        if cached is not None:
+            text, warning = cached
+            if warning:
+                st.warning(warning)
+            return text
+        
+        warning, complete = None, True
         if file_extension == 'pdf':
-            return FileHandler.extract_text_from_pdf(uploaded_file)
+            text, warning, complete = FileHandler._extract_pdf(data)
+            if warning:
+                st.warning(warning)
         elif file_extension in ['docx', 'doc']:
-            return FileHandler.extract_text_from_docx(uploaded_file)
-        elif file_extension == 'txt':
-            return str(uploaded_file.read(), "utf-8")
+            text = FileHandler.extract_text_from_docx(BytesIO(data))
         else:
-            st.error("Unsupported file format. Please upload PDF, DOCX, or TXT files.")
-            return None
+            text = str(data, "utf-8")
+        
+        # Failed extractions return "" and time-limited ones are partial;
+        # both are retried on the next run
+        if text and complete:
+            _extraction_cache.set(cache_key, (text, warning))
+        return text
     
     @staticmethod
     def save_temp_file(content: str, filename: str, format_type: str = "txt") -> str:
@@ -0,0 +1,302 @@
+import json
+import os
+import shutil
+import threading
+import numpy as np
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
+from config.settings import settings
+from .analytics import CVAnalytics
+from .cv_model import ParsedCV
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+class _Segment(NamedTuple):
+    """One immutable batch of postings, arrays memory-mapped from disk"""
+    path: str
+    base: int                  # global number of the segment's first posting
+    vocabulary: Dict[str, int]  # keyword -> term number
+    offsets: np.ndarray        # term number -> start in doc_ids/weights, len(terms) + 1
+    doc_ids: np.ndarray        # local doc number per posting, grouped by term
+    weights: np.ndarray        # keyword weight per posting
+    totals: np.ndarray         # total keyword weight per doc
+    record_offsets: np.ndarray  # byte offset of each doc's line in docs.jsonl
+
+
+class JobIndex:
+    """On-disk inverted index of job postings, queried with a CV.
+
+    Every posting's keywords come from CVAnalytics' extractor. For each
+    keyword the index stores the postings that contain it with the keyword's
+    weight there, plus each posting's total weight, which is all the match
+    score of analyze_keyword_match needs: the share of a posting's keyword
+    weight that the CV covers. A query only touches the lists of the CV's
+    keywords, so it costs milliseconds instead of a rescore of every posting.
+
+    ``add`` writes a new immutable segment and then swaps the manifest, so
+    readers never see a half-written segment; ``compact`` merges segments
+    into one. Segments are numpy arrays opened with ``mmap_mode='r'`` and
+    only the pages a query touches are read. One writer at a time is
+    assumed; readers pick up new segments on their next search.
+
+    Layout of ``path``:
+        manifest.json          {"version": 1, "segments": [{"name", "docs"}], "next_segment"}
+        seg-000001/terms.json  keywords, position is the term number
+        seg-000001/*.npy       offsets, doc_ids, weights, totals, record_offsets
+        seg-000001/docs.jsonl  one posting per line: job_id, job_description, metadata
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._segments: List[_Segment] = []
+        self._manifest_version = None
+
+    # ------------------------------------------------------------------
+    # Manifest and segments
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST)
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self._manifest_path(), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {"version": FORMAT_VERSION, "segments": [], "next_segment": 1}
+        if manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported job index version in {self.path}: {manifest.get('version')}")
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        temp_path = self._manifest_path() + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, self._manifest_path())
+
+    def _open_segment(self, name: str, base: int) -> _Segment:
+        path = os.path.join(self.path, name)
+        with open(os.path.join(path, "terms.json"), encoding='utf-8') as f:
+            terms = json.load(f)
+
+        def load(array_name: str) -> np.ndarray:
+            return np.load(os.path.join(path, f"{array_name}.npy"), mmap_mode='r')
+
+        return _Segment(
+            path, base, {term: i for i, term in enumerate(terms)},
+            load("offsets"), load("doc_ids"), load("weights"), load("totals"), load("record_offsets")
+        )
+
+    def _current_segments(self) -> List[_Segment]:
+        """Open segments, reopened when another writer changed the manifest"""
+        try:
+            # The manifest is replaced, never rewritten in place, so a new inode means a new version
+            stat = os.stat(self._manifest_path())
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        with self._lock:
+            if version != self._manifest_version:
+                segments, base = [], 0
+                for entry in self._read_manifest()["segments"]:
+                    segments.append(self._open_segment(entry["name"], base))
+                    base += entry["docs"]
+                self._segments = segments
+                self._manifest_version = version
+            return self._segments
+
+    def __len__(self) -> int:
+        return sum(entry["docs"] for entry in self._read_manifest()["segments"])
+
+    def job_ids(self) -> set:
+        ids = set()
+        for segment in self._current_segments():
+            with open(os.path.join(segment.path, "docs.jsonl"), encoding='utf-8') as f:
+                ids.update(json.loads(line)["job_id"] for line in f)
+        return ids
+
+    # ------------------------------------------------------------------
+    # Writing
+
+    @staticmethod
+    def _write_segment(path: str, postings: Dict[str, List], totals: List[float], records: List[bytes]):
+        """postings: keyword -> ([doc numbers], [weights]); records: encoded docs.jsonl lines"""
+        os.makedirs(path)
+        terms = list(postings)
+        lengths = [len(postings[term][0]) for term in terms]
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        doc_ids = np.empty(int(offsets[-1]), dtype=np.int32)
+        weights = np.empty(int(offsets[-1]), dtype=np.float64)
+        for term, start, end in zip(terms, offsets[:-1], offsets[1:]):
+            doc_ids[start:end], weights[start:end] = postings[term]
+
+        record_offsets = np.zeros(len(records), dtype=np.int64)
+        if records:
+            np.cumsum([len(record) for record in records[:-1]], out=record_offsets[1:])
+
+        with open(os.path.join(path, "terms.json"), 'w', encoding='utf-8') as f:
+            json.dump(terms, f, ensure_ascii=False)
+        with open(os.path.join(path, "docs.jsonl"), 'wb') as f:
+            f.writelines(records)
+        for name, array in (("offsets", offsets), ("doc_ids", doc_ids), ("weights", weights),
+                            ("totals", np.asarray(totals, dtype=np.float64)),
+                            ("record_offsets", record_offsets)):
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+    def _commit_segment(self, manifest: Dict[str, Any], build) -> str:
+        """Write a segment via build(path) under a temporary name, then publish it"""
+        name = f"seg-{manifest['next_segment']:06d}"
+        path = os.path.join(self.path, name)
+        temp_path = path + ".tmp"
+        # Either can be left over from an interrupted write; the manifest doesn't reference them
+        for stale in (temp_path, path):
+            if os.path.exists(stale):
+                shutil.rmtree(stale)
+        build(temp_path)
+        os.rename(temp_path, path)
+        manifest["next_segment"] += 1
+        return name
+
+    def add(self, jobs: Iterable[Dict[str, Any]], skip_existing: bool = True) -> int:
+        """
+        Index job postings as a new segment. Each job is a dict with
+        "job_id" and "job_description"; any other keys are stored and
+        returned with search results. Returns the number of postings added.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        seen = self.job_ids() if skip_existing else set()
+
+        postings: Dict[str, List] = {}
+        totals: List[float] = []
+        records: List[bytes] = []
+        for job in jobs:
+            job_id = str(job["job_id"])
+            description = job.get("job_description") or ""
+            if job_id in seen or not description.strip():
+                continue
+            seen.add(job_id)
+
+            doc = len(totals)
+            keywords = CVAnalytics.extract_important_keywords(description)
+            for keyword, weight in keywords.items():
+                entry = postings.get(keyword)
+                if entry is None:
+                    entry = postings[keyword] = ([], [])
+                entry[0].append(doc)
+                entry[1].append(weight)
+            totals.append(sum(keywords.values()))
+            record = dict(job, job_id=job_id)
+            records.append((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+
+        if not totals:
+            return 0
+
+        manifest = self._read_manifest()
+        name = self._commit_segment(
+            manifest, lambda path: self._write_segment(path, postings, totals, records)
+        )
+        manifest["segments"].append({"name": name, "docs": len(totals)})
+        self._write_manifest(manifest)
+        return len(totals)
+
+    def compact(self) -> int:
+        """Merge all segments into one; returns the number of segments merged"""
+        manifest = self._read_manifest()
+        segments = self._current_segments()
+        if len(segments) < 2:
+            return 0
+
+        postings: Dict[str, List] = {}
+        totals: List[np.ndarray] = []
+        records: List[bytes] = []
+        for segment in segments:
+            local_base = len(records)
+            for term, column in segment.vocabulary.items():
+                start, end = segment.offsets[column], segment.offsets[column + 1]
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = ([], [])
+                entry[0].append(segment.doc_ids[start:end] + local_base)
+                entry[1].append(segment.weights[start:end])
+            totals.append(segment.totals)
+            with open(os.path.join(segment.path, "docs.jsonl"), 'rb') as f:
+                records.extend(f)
+
+        merged = {
+            term: (np.concatenate(doc_ids), np.concatenate(weights))
+            for term, (doc_ids, weights) in postings.items()
+        }
+        name = self._commit_segment(
+            manifest, lambda path: self._write_segment(path, merged, np.concatenate(totals), records)
+        )
+        old_names = [entry["name"] for entry in manifest["segments"]]
+        manifest["segments"] = [{"name": name, "docs": len(records)}]
+        self._write_manifest(manifest)
+        # Readers that still hold the old mappings keep working on POSIX
+        for old_name in old_names:
+            shutil.rmtree(os.path.join(self.path, old_name), ignore_errors=True)
+        return len(old_names)
+
+    # ------------------------------------------------------------------
+    # Querying
+
+    @staticmethod
+    def _read_record(segment: _Segment, doc: int) -> Dict[str, Any]:
+        with open(os.path.join(segment.path, "docs.jsonl"), 'rb') as f:
+            f.seek(int(segment.record_offsets[doc]))
+            return json.loads(f.readline())
+
+    def search(self, cv_content: Union[str, ParsedCV], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        The k postings with the highest analyze_keyword_match score for the
+        CV, best first, ties in indexing order. Postings sharing no keyword
+        with the CV are not returned. Each result is the stored posting with
+        "match_percentage" added; k of 0 or less gives no results.
+        """
+        if k <= 0:
+            return []
+        cv_keywords = CVAnalytics._cv_keywords(cv_content, CVAnalytics._cv_hash(cv_content))
+        candidates = []
+        for segment in self._current_segments():
+            columns = [segment.vocabulary[keyword] for keyword in cv_keywords if keyword in segment.vocabulary]
+            if not columns:
+                continue
+            # Sum the weights of each doc's matched keywords over the CV's postings lists
+            slices = [slice(segment.offsets[column], segment.offsets[column + 1]) for column in columns]
+            doc_ids = np.concatenate([segment.doc_ids[s] for s in slices])
+            weights = np.concatenate([segment.weights[s] for s in slices])
+            matched = np.bincount(doc_ids, weights=weights, minlength=len(segment.totals))
+
+            docs = np.flatnonzero(matched)
+            scores = matched[docs] / segment.totals[docs] * 100
+            if len(docs) > k:
+                # Keep everything tied with the k-th best so ties resolve by order below
+                threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+                keep = scores >= threshold
+                docs, scores = docs[keep], scores[keep]
+            candidates.extend((score, segment.base + doc, segment, doc) for score, doc in zip(scores, docs))
+
+        candidates.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+        results = []
+        for score, _, segment, doc in candidates[:k]:
+            record = self._read_record(segment, doc)
+            record["match_percentage"] = round(float(score), 2)
+            results.append(record)
+        return results
+
+
+_job_index: Optional[JobIndex] = None
+_job_index_lock = threading.Lock()
+
+
+def get_job_index() -> JobIndex:
+    """Process-wide index at settings.job_index_path"""
+    global _job_index
+    if _job_index is None:
+        with _job_index_lock:
+            if _job_index is None:
+                _job_index = JobIndex(settings.job_index_path)
+    return _job_index
@@ -0,0 +1,243 @@
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Tuple
+
+# Common stop words skipped when counting single words
+STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had',
+    'do', 'does', 'did', 'will', 'would', 'could', 'should', 'this', 'that',
+    'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'who', 'what',
+    'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more',
+    'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same',
+    'so', 'than', 'too', 'very', 'can', 'just', 'now', 'get', 'may', 'new',
+    'work', 'also', 'well', 'way', 'even', 'back', 'good', 'make', 'first',
+    'through', 'after', 'without', 'around', 'must', 'need', 'using', 'used',
+    'our', 'your', 'their', 'one', 'two', 'three', 'include', 'including'
+})
+
+# Technical abbreviations and short terms (whole words)
+TECH_ABBREVIATIONS = (
+    'ml', 'ai', 'api', 'sql', 'aws', 'gcp',
+    'etl', 'ci', 'cd', 'ui', 'ux', 'id',
+    'kpi', 'roi', 'crm', 'erp', 'seo', 'ppc',
+    'hr', 'pr', 'it', 'qa', 'ba', 'pm'
+)
+
+# Compound terms and phrases, matched anywhere in the text with any run of
+# whitespace between words. A trailing "s?" marks an optional plural.
+COMPOUND_TERMS = (
+    'machine learning', 'deep learning', 'data science', 'data analysis',
+    'artificial intelligence', 'computer vision', 'natural language',
+    'project management', 'product management', 'customer service',
+    'business intelligence', 'software development', 'web development',
+    'quality assurance', 'user experience', 'digital marketing',
+    'financial analysis', 'risk management', 'supply chain',
+    'human resources', 'sales management', 'content creation',
+    'large language models?', 'language models?', 'mlops', 'devops',
+    'data engineering', 'software engineering', 'model deployment',
+    'feature engineering', 'cross functional', 'full stack',
+    'front end', 'back end', 'real time', 'big data'
+)
+
+# LLMs and model terms, anchored at a word start. Single words must also end
+# at a word boundary.
+LLM_TERMS = (
+    'llms?', 'gpt', 'bert', 'transformer', 'neural network',
+    'deep neural', 'language model', 'generative ai'
+)
+
+# Role-specific terms (whole words)
+ROLE_TERMS = (
+    'engineer', 'developer', 'analyst', 'manager', 'specialist', 'coordinator',
+    'director', 'lead', 'senior', 'junior', 'scientist', 'architect', 'consultant'
+)
+
+# Technology and framework terms (whole words)
+TECH_TERMS = (
+    'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node', 'docker',
+    'kubernetes', 'terraform', 'git', 'jenkins', 'jira', 'slack', 'excel',
+    'powerbi', 'tableau', 'salesforce', 'hubspot'
+)
+
+ABBREVIATION_WEIGHT = 2
+COMPOUND_WEIGHT = 3
+ACRONYM_WEIGHT = 2
+LLM_WEIGHT = 3
+ROLE_WEIGHT = 1.5
+TECH_WEIGHT = 2
+
+
+class _Phrase(NamedTuple):
+    words: Tuple[str, ...]
+    plural: bool
+    anchored: bool
+    counts: int
+
+
+class KeywordExtractor:
+    """Weighted keyword extraction compiled once and shared by every caller.
+
+    A document is lowercased and split into words and separators in a single
+    scan. Word-level terms are then read from one token count, and phrases are
+    matched by walking the token sequence from the tokens that can start them,
+    so the cost no longer grows with the number of patterns. Weights and key
+    order are the same as the former one-``re.findall``-per-pattern sweep.
+    """
+
+    def __init__(self):
+        self._split_re = re.compile(r'(\W+)')
+        self._acronym_re = re.compile(r'\b[A-Z]{2,6}\b')
+
+        # Single-word compound terms match inside any word
+        self._substring_terms = tuple(
+            (index, term) for index, term in enumerate(COMPOUND_TERMS) if ' ' not in term
+        )
+
+        self._phrases: List[_Phrase] = []
+        for index, term in enumerate(COMPOUND_TERMS):
+            if ' ' in term:
+                self._phrases.append(self._compile_phrase(term, index, anchored=False))
+        for index, term in enumerate(LLM_TERMS):
+            self._phrases.append(self._compile_phrase(term, len(COMPOUND_TERMS) + index, anchored=True))
+
+        first_words = set()
+        for phrase in self._phrases:
+            first_words.add(phrase.words[0])
+            if phrase.plural and len(phrase.words) == 1:
+                first_words.add(phrase.words[0] + 's')
+        self._first_words = tuple(sorted(first_words))
+
+    @staticmethod
+    def _compile_phrase(term: str, counts: int, anchored: bool) -> _Phrase:
+        plural = term.endswith('s?')
+        words = tuple((term[:-2] if plural else term).split())
+        return _Phrase(words, plural, anchored, counts)
+
+    def _starts_at(self, token: str) -> List[_Phrase]:
+        """Phrases whose first word can be matched by this token."""
+        if not token.endswith(self._first_words):
+            return []
+
+        phrases = []
+        for phrase in self._phrases:
+            first = phrase.words[0]
+            if len(phrase.words) == 1:
+                # Whole word, optionally plural
+                matched = token == first or (phrase.plural and token == first + 's')
+            elif phrase.anchored:
+                matched = token == first
+            else:
+                # The first word may end a longer word
+                matched = token.endswith(first)
+            if matched:
+                phrases.append(phrase)
+        return phrases
+
+    @staticmethod
+    def _match_phrase(phrase: _Phrase, tokens: List[str], separators: List[str], index: int) -> str:
+        """Return the normalized phrase starting at tokens[index], or ''."""
+        words = phrase.words
+        if len(words) == 1:
+            return tokens[index]
+
+        last = len(words) - 1
+        if index + last >= len(tokens):
+            return ''
+        for offset in range(1, last + 1):
+            if not separators[index + offset - 1].isspace():
+                return ''
+            token = tokens[index + offset]
+            if offset < last:
+                if token != words[offset]:
+                    return ''
+            elif phrase.plural and token.startswith(words[last] + 's'):
+                return ' '.join(words[:last]) + ' ' + words[last] + 's'
+            elif not token.startswith(words[last]):
+                return ''
+        return ' '.join(words)
+
+    def _count_phrases(self, tokens: List[str], separators: List[str],
+                       token_counts: Dict[str, int]) -> List[Dict[str, int]]:
+        """Count phrase matches per term, keys in first-occurrence order."""
+        phrase_counts: List[Dict[str, int]] = [{} for _ in range(len(COMPOUND_TERMS) + len(LLM_TERMS))]
+
+        for index, term in self._substring_terms:
+            total = sum(token.count(term) * count for token, count in token_counts.items() if term in token)
+            if total:
+                phrase_counts[index][term] = total
+
+        starts = {}
+        for token in token_counts:
+            phrases = self._starts_at(token)
+            if phrases:
+                starts[token] = phrases
+
+        if starts:
+            for index, token in enumerate(tokens):
+                phrases = starts.get(token)
+                if phrases is None:
+                    continue
+                for phrase in phrases:
+                    key = self._match_phrase(phrase, tokens, separators, index)
+                    if key:
+                        counts = phrase_counts[phrase.counts]
+                        counts[key] = counts.get(key, 0) + 1
+
+        return phrase_counts
+
+    def extract(self, text: str) -> Dict[str, float]:
+        """Extract keywords with weights, higher weights for technical terms."""
+        parts = self._split_re.split(text.lower())
+        tokens = parts[0::2]
+        separators = parts[1::2]
+        token_counts = Counter(tokens)
+
+        phrase_counts = self._count_phrases(tokens, separators, token_counts)
+
+        keywords: Dict[str, float] = {}
+
+        # 1. Technical abbreviations and short terms
+        for term in TECH_ABBREVIATIONS:
+            count = token_counts.get(term)
+            if count:
+                keywords[term] = keywords.get(term, 0) + ABBREVIATION_WEIGHT * count
+
+        # 2. Compound terms and phrases
+        for counts in phrase_counts[:len(COMPOUND_TERMS)]:
+            for key, count in counts.items():
+                keywords[key] = keywords.get(key, 0) + COMPOUND_WEIGHT * count
+
+        # 3. Acronyms (2-6 uppercase letters), case matters here
+        for acronym, count in Counter(self._acronym_re.findall(text)).items():
+            key = acronym.lower()
+            keywords[key] = keywords.get(key, 0) + ACRONYM_WEIGHT * count
+
+        # 4. LLMs and model terms
+        for counts in phrase_counts[len(COMPOUND_TERMS):]:
+            for key, count in counts.items():
+                keywords[key] = keywords.get(key, 0) + LLM_WEIGHT * count
+
+        # 5. Regular words, without overwriting higher-weighted terms
+        for word, count in token_counts.items():
+            if (len(word) > 1 and word.isascii() and word.isalpha()
+                    and word not in STOP_WORDS and word not in keywords):
+                keywords[word] = count
+
+        # 6. Role-specific terms
+        for term in ROLE_TERMS:
+            count = token_counts.get(term)
+            if count:
+                keywords[term] = keywords.get(term, 0) + ROLE_WEIGHT * count
+
+        # 7. Technology and framework terms
+        for term in TECH_TERMS:
+            count = token_counts.get(term)
+            if count:
+                keywords[term] = keywords.get(term, 0) + TECH_WEIGHT * count
+
+        return keywords
+
+
+# Global instance, compiled once at import
+keyword_extractor = KeywordExtractor()
@@ -0,0 +1,80 @@
+import numpy as np
+from scipy import sparse
+from typing import Dict, List, Sequence
+
+class KeywordMatrix:
+    """Weighted keyword maps of many documents as one sparse matrix.
+
+    Rows are documents, columns a shared vocabulary, values the keyword
+    weights from the extractor. Within a row the entries keep the keyword
+    order of the source map, which is what breaks weight ties in
+    ``analyze_keyword_match``.
+    """
+
+    def __init__(self, keyword_maps: Sequence[Dict[str, float]], vocabulary: Dict[str, int] = None):
+        self.vocabulary: Dict[str, int] = {} if vocabulary is None else vocabulary
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        vocabulary = self.vocabulary
+        add_term = vocabulary.setdefault
+        for keywords in keyword_maps:
+            # New keywords get the next free column
+            indices.extend([add_term(keyword, len(vocabulary)) for keyword in keywords])
+            data.extend(keywords.values())
+            indptr.append(len(indices))
+
+        # Built directly in CSR form; indices are deliberately left unsorted
+        self.matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(keyword_maps), max(len(self.vocabulary), 1))
+        )
+        self._terms = None
+
+    @property
+    def terms(self) -> np.ndarray:
+        """Column index -> keyword"""
+        if self._terms is None or len(self._terms) != len(self.vocabulary):
+            terms = np.empty(len(self.vocabulary), dtype=object)
+            for keyword, column in self.vocabulary.items():
+                terms[column] = keyword
+            self._terms = terms
+        return self._terms
+
+    def presence(self, keywords: Dict[str, float]) -> np.ndarray:
+        """0/1 vector over the vocabulary for the keywords of one document"""
+        vector = np.zeros(self.matrix.shape[1], dtype=np.float64)
+        columns = [self.vocabulary[keyword] for keyword in keywords if keyword in self.vocabulary]
+        vector[columns] = 1.0
+        return vector
+
+    def match_percentages(self, present: np.ndarray) -> np.ndarray:
+        """Share of each row's weight whose keywords are present, in percent"""
+        totals = np.asarray(self.matrix.sum(axis=1)).ravel()
+        matched = self.matrix @ present
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentages = np.where(totals > 0, matched / totals * 100, 0.0)
+        return np.round(percentages, 2)
+
+    def top_missing(self, present: np.ndarray, k: int) -> List[List[str]]:
+        """Per row, the k heaviest keywords not present, ties in source order"""
+        matrix = self.matrix
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        positions = np.arange(matrix.nnz) - matrix.indptr[rows]
+        missing = present[matrix.indices] == 0
+
+        rows, positions = rows[missing], positions[missing]
+        weights, columns = matrix.data[missing], matrix.indices[missing]
+
+        # Sort by row, then weight descending, then original position
+        order = np.lexsort((positions, -weights, rows))
+        rows, columns = rows[order], columns[order]
+
+        # Rank within each row, keep the first k
+        starts = np.searchsorted(rows, np.arange(matrix.shape[0]))
+        ranks = np.arange(len(rows)) - starts[rows]
+        keep = ranks < k
+        rows, terms = rows[keep], self.terms[columns[keep]]
+
+        bounds = np.searchsorted(rows, np.arange(matrix.shape[0] + 1))
+        return [terms[bounds[i]:bounds[i + 1]].tolist() for i in range(matrix.shape[0])]
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Headless batch mode: tailor one CV against many job descriptions.
+
+Reads job descriptions from a directory (one .txt/.md file per job) or a
+JSONL file, and appends one JSON result per job to the output file. Rerunning
+with the same output skips jobs that already succeeded.
+
+Example:
+    python batch.py --cv my_cv.pdf --jobs postings.jsonl --output results.jsonl --concurrency 4
+"""
+
+import argparse
+import os
+import sys
+from io import BytesIO
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_cv(path: str) -> str:
+    from app.utils.file_handler import FileHandler
+
+    with open(path, 'rb') as f:
+        upload = BytesIO(f.read())
+    upload.name = os.path.basename(path)
+    return FileHandler.extract_text_from_file(upload) or ""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cv', required=True, help='CV file (PDF, DOCX or TXT)')
+    parser.add_argument('--jobs', required=True, help='directory of job descriptions or a JSONL file')
+    parser.add_argument('--output', required=True, help='JSONL file results are appended to')
+    parser.add_argument('--concurrency', type=int, default=None, help='jobs processed at once (default: LLM_MAX_CONCURRENCY)')
+    parser.add_argument('--job-type', default='general', help='default job type, e.g. ml_engineer')
+    parser.add_argument('--tone', default='professional', help='cover letter tone')
+    parser.add_argument('--no-cover-letter', action='store_true', help='only tailor the CV')
+    parser.add_argument('--no-resume', action='store_true', help='overwrite the output instead of resuming')
+    args = parser.parse_args()
+
+    from app.services.batch_runner import BatchRunner, load_jobs
+
+    original_cv = read_cv(args.cv)
+    if not original_cv.strip():
+        print(f"Could not read any text from {args.cv}", file=sys.stderr)
+        return 1
+
+    runner = BatchRunner(max_concurrency=args.concurrency, include_cover_letter=not args.no_cover_letter)
+
+    def report(record, summary):
+        processed = summary['ok'] + summary['failed']
+        status = record['status'] if record['status'] == 'ok' else f"{record['status']}: {record.get('errors')}"
+        print(f"[{processed}] {record['job_id']} {status} | {summary['jobs_per_minute']:.1f} jobs/min", flush=True)
+
+    try:
+        summary = runner.run(
+            original_cv,
+            load_jobs(args.jobs),
+            args.output,
+            job_type=args.job_type,
+            tone=args.tone,
+            resume=not args.no_resume,
+            on_result=report
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume.", file=sys.stderr)
+        return 130
+
+    print(
+        f"Done: {summary['ok']} ok, {summary['failed']} failed, {summary['skipped']} skipped "
+        f"in {summary['elapsed']:.1f}s ({summary['jobs_per_minute']:.1f} jobs/min)"
+    )
+    return 0 if summary['failed'] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
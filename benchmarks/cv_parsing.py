@@ -0,0 +1,173 @@
+"""
+Benchmark CV field parsing on large CVs.
+
+Compares the former SilentGoogleTracker._parse_cv_content (repeated splits,
+uncompiled regexes and a line scan per keyword list) with the single-pass
+CVParser, and checks that both return the same fields. CVParser also builds
+the work experience and education sections of the ParsedCV model.
+
+Usage: python benchmarks/cv_parsing.py [--lines 20000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.utils.cv_parser import cv_parser
+
+FILLER = ['Delivered', 'a', 'platform', 'for', 'customers', 'with', 'Python', 'and', 'AWS', 'reduced',
+          'latency', 'by', '40%', 'led', 'team', 'of', 'engineers', 'across', 'three', 'regions']
+
+
+def legacy_parse(cv_content: str) -> dict:
+    """The former SilentGoogleTracker._parse_cv_content, without its field truncation"""
+    cv_lower = cv_content.lower()
+    
+    # Extract name (first few words, usually at the top)
+    lines = cv_content.strip().split('\n')
+    potential_name = ""
+    for line in lines[:5]:  # Check first 5 lines
+        line = line.strip()
+        if line and len(line.split()) <= 4 and not any(char in line for char in '@+.'):
+            if not any(word in line.lower() for word in ['cv', 'resume', 'curriculum', 'vitae']):
+                potential_name = line
+                break
+    
+    # Extract email
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    email_match = re.search(email_pattern, cv_content)
+    email = email_match.group() if email_match else ""
+    
+    # Extract phone
+    phone_patterns = [
+        r'\+?[\d\s\-\(\)]{10,}',
+        r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
+        r'\b\d{2,4}[-.\s]?\d{3}[-.\s]?\d{3,4}\b'
+    ]
+    phone = ""
+    for pattern in phone_patterns:
+        phone_match = re.search(pattern, cv_content)
+        if phone_match:
+            phone = phone_match.group().strip()
+            break
+    
+    # Extract location
+    location_keywords = ['istanbul', 'ankara', 'izmir', 'turkey', 'turkiye', 'usa', 'uk', 'germany']
+    location = ""
+    for keyword in location_keywords:
+        if keyword in cv_lower:
+            for line in cv_content.split('\n'):
+                if keyword in line.lower():
+                    location = line.strip()
+                    break
+            break
+    
+    # Extract skills
+    skills = ""
+    skill_indicators = ['skill', 'technical', 'programming', 'software', 'tools', 'technologies']
+    cv_lines = cv_content.split('\n')
+    
+    for i, line in enumerate(cv_lines):
+        if any(indicator in line.lower() for indicator in skill_indicators):
+            skills_lines = []
+            for j in range(i, min(i+5, len(cv_lines))):
+                if cv_lines[j].strip():
+                    skills_lines.append(cv_lines[j].strip())
+            skills = ' | '.join(skills_lines)
+            break
+    
+    # Extract experience years
+    experience_years = ""
+    year_patterns = [
+        r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)',
+        r'(\d+)\+?\s*year\s*(?:of\s*)?(?:experience|exp)',
+    ]
+    for pattern in year_patterns:
+        match = re.search(pattern, cv_lower)
+        if match:
+            experience_years = f"{match.group(1)} years"
+            break
+    
+    # Extract education
+    education = ""
+    education_keywords = ['university', 'college', 'degree', 'bachelor', 'master', 'phd', 'education']
+    for line in cv_content.split('\n'):
+        if any(keyword in line.lower() for keyword in education_keywords):
+            education = line.strip()
+            break
+    
+    return {
+        'name': potential_name,
+        'email': email,
+        'phone': phone,
+        'location': location,
+        'skills': skills,
+        'experience_years': experience_years,
+        'education': education
+    }
+
+
+def parsed_fields(cv_content: str) -> dict:
+    """CVParser output in the former parser's shape"""
+    parsed = cv_parser.parse(cv_content)
+    return {
+        'name': parsed.contact.name,
+        'email': parsed.contact.email,
+        'phone': parsed.contact.phone,
+        'location': parsed.contact.location,
+        'skills': parsed.skills.summary,
+        'experience_years': parsed.experience_years,
+        'education': parsed.education.summary
+    }
+
+
+def make_cv(rng: random.Random, lines: int, keywords_at: float) -> str:
+    """A CV with the contact block on top and keyword lines placed at a fraction of the body"""
+    body = [' '.join(rng.choice(FILLER) for _ in range(rng.randint(6, 18))) for _ in range(lines)]
+    position = int(lines * keywords_at)
+    body[position:position] = [
+        'Based in Berlin, Germany',
+        'Technical Skills',
+        'Python, SQL, Docker, Kubernetes',
+        '',
+        'Terraform, AWS',
+        'MSc Computer Science, Technical University of Munich',
+        '8+ years of experience building data platforms'
+    ]
+    return '\n'.join(['Jane Doe', 'jane.doe@example.com', '+49 151 2345 6789', ''] + body)
+
+
+def median_time(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=20000, help='body lines per CV')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per method, the median is reported')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for label, keywords_at in (("keywords near the top", 0.0), ("keywords at the end", 1.0)):
+        cv = make_cv(rng, args.lines, keywords_at)
+        assert legacy_parse(cv) == parsed_fields(cv), "CVParser disagrees with the former parser"
+        legacy_time = median_time(lambda: legacy_parse(cv), args.repeat)
+        parser_time = median_time(lambda: cv_parser.parse(cv), args.repeat)
+        print(f"{len(cv) / 1024:.0f} KB CV, {label}, fields identical")
+        print(f"  former parser:  {legacy_time * 1000:8.2f} ms")
+        print(f"  CVParser:       {parser_time * 1000:8.2f} ms  ({legacy_time / parser_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark "best matching jobs for this CV" lookups.
+
+Indexes synthetic job postings with JobIndex, then compares a top-k search
+of the on-disk inverted index with rescoring every posting
+(CVAnalytics.batch_keyword_match over the whole store, keywords already
+extracted). Both must return the same ranking.
+
+Usage: python benchmarks/job_search.py [--jobs 20000] [--top 10] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app.utils.analytics as analytics
+from app.utils.analytics import CVAnalytics
+from app.utils.cache import LRUCache, content_hash
+from app.utils.job_index import JobIndex
+from app.utils.keyword_extractor import ROLE_TERMS, TECH_TERMS
+
+FILLER = ['team', 'build', 'product', 'customers', 'delivery', 'ownership', 'remote', 'growth',
+          'machine learning', 'large language models', 'AWS', 'ML', 'CI/CD', 'data pipelines']
+
+
+def make_document(rng: random.Random, vocabulary, words: int) -> str:
+    return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+
+def median_time(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=20000, help='number of indexed job postings')
+    parser.add_argument('--top', type=int, default=10, help='results per search')
+    parser.add_argument('--segments', type=int, default=4, help='segments the postings are added in')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per method, the median is reported')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # Company-specific words give the store a long tail of rare keywords
+    vocabulary = list(TECH_TERMS) + list(ROLE_TERMS) + FILLER + [f"tool{i}" for i in range(5000)]
+    cv = make_document(rng, vocabulary, 400)
+    jobs = [
+        {"job_id": str(i), "job_description": make_document(rng, vocabulary, rng.randint(80, 300))}
+        for i in range(args.jobs)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = JobIndex(os.path.join(directory, "jobs"))
+        start = time.perf_counter()
+        chunk = -(-len(jobs) // args.segments)
+        for offset in range(0, len(jobs), chunk):
+            index.add(jobs[offset:offset + chunk], skip_existing=False)
+        build = time.perf_counter() - start
+
+        # Warm both paths: extracted keywords for the rescoring loop, open segments for the index
+        analytics._keyword_cache = LRUCache(args.jobs + 1)
+        for job in jobs:
+            CVAnalytics._cached_keywords(job["job_description"], content_hash(job["job_description"]))
+        descriptions = [job["job_description"] for job in jobs]
+
+        def rescore():
+            scores = CVAnalytics.batch_keyword_match(cv, descriptions)
+            ranked = sorted(range(len(jobs)), key=lambda i: (-scores[i]["match_percentage"], i))
+            return [(jobs[i]["job_id"], scores[i]["match_percentage"]) for i in ranked[:args.top]]
+
+        def search():
+            return [(r["job_id"], r["match_percentage"]) for r in index.search(cv, k=args.top)]
+
+        assert rescore() == search(), "index search disagrees with rescoring every posting"
+
+        rescore_time = median_time(rescore, args.repeat)
+        search_time = median_time(search, args.repeat)
+        reopen_time = median_time(lambda: JobIndex(index.path).search(cv, k=args.top), args.repeat)
+
+    print(f"{args.jobs} postings in {args.segments} segments, top {args.top} identical")
+    print(f"index build (incl. extraction): {build * 1000:9.1f} ms")
+    print(f"rescore every posting:          {rescore_time * 1000:9.1f} ms")
+    print(f"index search:                   {search_time * 1000:9.1f} ms  ({rescore_time / search_time:.0f}x)")
+    print(f"index search, cold open:        {reopen_time * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark bulk keyword-match scoring of one CV against many job descriptions.
+
+Compares the per-pair loop (CVAnalytics.analyze_keyword_match for every job
+description) with the sparse-matrix path (CVAnalytics.batch_keyword_match).
+Keyword extraction is done once up front and shared by both, so the timings
+compare the scoring itself; extraction cost is reported separately.
+
+Usage: python benchmarks/keyword_scoring.py [--jobs 2000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app.utils.analytics as analytics
+from app.utils.analytics import CVAnalytics
+from app.utils.cache import LRUCache, content_hash
+from app.utils.keyword_extractor import ROLE_TERMS, TECH_TERMS
+
+FILLER = ['team', 'build', 'product', 'customers', 'delivery', 'ownership', 'remote', 'growth',
+          'machine learning', 'large language models', 'AWS', 'ML', 'CI/CD', 'data pipelines']
+
+
+def make_document(rng: random.Random, words: int) -> str:
+    vocabulary = list(TECH_TERMS) + list(ROLE_TERMS) + FILLER
+    return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+
+def median_time(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=2000, help='number of job descriptions')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per method, the median is reported')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    cv = make_document(rng, 400)
+    jobs = [make_document(rng, rng.randint(80, 300)) for _ in range(args.jobs)]
+
+    # Large enough to hold every document, so both paths only score
+    analytics._keyword_cache = LRUCache(args.jobs + 1)
+    start = time.perf_counter()
+    for text in [cv] + jobs:
+        CVAnalytics._cached_keywords(text, content_hash(text))
+    extraction = time.perf_counter() - start
+
+    def per_pair():
+        analytics._analysis_cache.clear()
+        return [CVAnalytics.analyze_keyword_match(cv, job) for job in jobs]
+
+    def batch():
+        return CVAnalytics.batch_keyword_match(cv, jobs)
+
+    expected = [(r['match_percentage'], r['missing_keywords']) for r in per_pair()]
+    actual = [(r['match_percentage'], r['missing_keywords']) for r in batch()]
+    assert expected == actual, "batch scoring disagrees with analyze_keyword_match"
+
+    loop_time = median_time(per_pair, args.repeat)
+    batch_time = median_time(batch, args.repeat)
+    print(f"{args.jobs} job descriptions, results identical")
+    print(f"keyword extraction (once):  {extraction * 1000:9.1f} ms")
+    print(f"per-pair analyze loop:      {loop_time * 1000:9.1f} ms")
+    print(f"sparse batch scoring:       {batch_time * 1000:9.1f} ms  ({loop_time / batch_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark PDF rendering of long documents.
+
+Compares the current PDFGenerator layout engine (wrapping, headings, bullets,
+cached glyph widths, one text object per page) with the previous renderer,
+which drew every source line with canvas.drawString and never wrapped.
+
+Usage: python benchmarks/pdf_layout.py [--pages 12] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import PyPDF2
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from app.services.pdf_generator import PDFGenerator
+
+SECTION = """# Senior Machine Learning Engineer
+PROFESSIONAL EXPERIENCE
+**Lead ML Engineer, Example Corp (2019 - Present)**
+- Designed and shipped a retrieval-augmented generation platform serving millions of requests per day across several product lines, cutting latency by forty percent
+- Led a team of six engineers building feature stores, model registries and batch inference pipelines on Kubernetes and AWS
+- Mentored junior engineers and ran the internal reading group on large language models
+Built evaluation harnesses for ranking, classification and summarisation models, with dashboards that tracked quality regressions release over release and alerted the owning team automatically.
+
+SKILLS
+- Python, PyTorch, TensorFlow, scikit-learn, Spark, SQL, Docker, Kubernetes, Terraform
+"""
+
+
+def legacy_render(content: str) -> bytes:
+    """The renderer before the layout engine, kept for comparison"""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    c.setFont("Helvetica", 12)
+    y_position = height - 40
+    for line in content.split('\n'):
+        if y_position < 40:
+            c.showPage()
+            y_position = height - 40
+            c.setFont("Helvetica", 12)
+        c.drawString(40, y_position, line)
+        y_position -= 15
+    c.save()
+    return buffer.getvalue()
+
+
+def prewrap(content: str) -> str:
+    """The document as the engine lays it out, one drawn line per source line"""
+    pages = PDFGenerator._text_layout().layout(content)
+    return '\n'.join(line.text for page in pages for line in page)
+
+
+def build_document(pages: int) -> str:
+    """Repeat the sample section until the layout engine produces at least `pages` pages"""
+    sections = 1
+    while True:
+        content = SECTION * sections
+        if len(PyPDF2.PdfReader(BytesIO(PDFGenerator._render(content))).pages) >= pages:
+            return content
+        sections *= 2
+
+
+def time_call(func, content: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=12, help='minimum page count of the generated document')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per renderer, the median is reported')
+    args = parser.parse_args()
+
+    content = build_document(args.pages)
+    page_count = len(PyPDF2.PdfReader(BytesIO(PDFGenerator._render(content))).pages)
+    print(f"Document: {len(content):,} chars, {page_count} pages with wrapping")
+
+    legacy = time_call(legacy_render, content, args.repeat)
+    # Same drawn lines as the engine output, so both renderers emit comparable pages
+    legacy_wrapped = time_call(legacy_render, prewrap(content), args.repeat)
+    current = time_call(PDFGenerator._render, content, args.repeat)
+    print(f"legacy drawString, unwrapped:    {legacy * 1000:8.1f} ms")
+    print(f"legacy drawString, pre-wrapped:  {legacy_wrapped * 1000:8.1f} ms")
+    print(f"layout engine:                   {current * 1000:8.1f} ms  ({legacy_wrapped / current:.2f}x vs pre-wrapped)")
+
+    start = time.perf_counter()
+    PDFGenerator.generate_pdf(content)
+    PDFGenerator.generate_pdf(content)
+    print(f"generate_pdf, cold + cached:     {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
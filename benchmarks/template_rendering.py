@@ -0,0 +1,151 @@
+"""
+Benchmark rendering many CVs and cover letters, as a batch export does.
+
+Compares the former CVTemplate.format_professional_cv (str.format on the
+template and += concatenation per experience entry) with the compiled
+templates, and checks that both produce the same text.
+
+Usage: python benchmarks/template_rendering.py [--documents 5000] [--entries 8] [--repeat 5]
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.templates.cv_template import CVTemplate, CoverLetterTemplate
+
+
+def legacy_professional_cv(cv_data: dict) -> str:
+    """The former CVTemplate.format_professional_cv, for comparison"""
+    
+    template = """
+{header}
+
+PROFESSIONAL SUMMARY
+{professional_summary}
+
+KEY SKILLS
+{key_skills}
+
+WORK EXPERIENCE
+{work_experience}
+
+EDUCATION
+{education}
+
+{additional_sections}
+    """.strip()
+    
+    # Format header
+    header = cv_data.get('contact_info', '[Your Name]\n[Your Email] | [Your Phone]\n[Your Address]')
+    
+    # Format professional summary
+    professional_summary = cv_data.get('professional_summary', '')
+    
+    # Format key skills
+    skills = cv_data.get('key_skills', [])
+    if isinstance(skills, list):
+        key_skills = ' • '.join(skills)
+    else:
+        key_skills = skills
+    
+    # Format work experience
+    work_exp = cv_data.get('work_experience', [])
+    work_experience = ""
+    if isinstance(work_exp, list):
+        for exp in work_exp:
+            if isinstance(exp, dict):
+                work_experience += f"""
+{exp.get('role', '')} | {exp.get('company', '')}
+{exp.get('duration', '')}
+{exp.get('achievements', '')}
+
+"""
+            else:
+                work_experience += f"{exp}\n\n"
+    else:
+        work_experience = work_exp
+    
+    # Format education
+    education = cv_data.get('education', '')
+    
+    # Format additional sections
+    additional = cv_data.get('additional_sections', '')
+    
+    return template.format(
+        header=header,
+        professional_summary=professional_summary,
+        key_skills=key_skills,
+        work_experience=work_experience.strip(),
+        education=education,
+        additional_sections=additional
+    )
+
+
+def make_cv_data(index: int, entries: int) -> dict:
+    return {
+        'contact_info': f"Candidate {index}\ncandidate{index}@example.com | +1 555 0100",
+        'professional_summary': "Data engineer with a record of shipping reliable pipelines. " * 3,
+        'key_skills': ['Python', 'SQL', 'Spark', 'Airflow', 'AWS', 'Docker', 'Kubernetes', 'dbt'],
+        'work_experience': [
+            {
+                'role': f"Engineer {n}",
+                'company': f"Company {n}",
+                'duration': f"{2010 + n} - {2011 + n}",
+                'achievements': "- Built the ingestion platform\n- Cut costs by 30%\n- Led a team of five"
+            }
+            for n in range(entries)
+        ],
+        'education': "MSc Computer Science",
+        'additional_sections': "Languages: English, German"
+    }
+
+
+def median_time(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        # As timeit does, keep collections of the rendered strings out of the timings
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+            gc.collect()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--documents', type=int, default=5000, help='CVs rendered per run')
+    parser.add_argument('--entries', type=int, default=8, help='work experience entries per CV')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per method, the median is reported')
+    args = parser.parse_args()
+
+    documents = [make_cv_data(i, args.entries) for i in range(args.documents)]
+    assert [legacy_professional_cv(d) for d in documents[:50]] == \
+        [CVTemplate.format_professional_cv(d) for d in documents[:50]], "compiled template output differs"
+
+    legacy_time = median_time(lambda: [legacy_professional_cv(d) for d in documents], args.repeat)
+    compiled_time = median_time(lambda: [CVTemplate.format_professional_cv(d) for d in documents], args.repeat)
+    modern_time = median_time(lambda: [CVTemplate.format_modern_cv(d) for d in documents], args.repeat)
+    letter_time = median_time(lambda: [
+        CoverLetterTemplate.format_professional_cover_letter("Dear team, ..." * 40, f"Company {i}", applicant_name=f"Candidate {i}")
+        for i in range(args.documents)
+    ], args.repeat)
+
+    print(f"{args.documents} CVs with {args.entries} experience entries, output identical")
+    print(f"former professional CV:    {legacy_time * 1000:8.1f} ms")
+    print(f"compiled professional CV:  {compiled_time * 1000:8.1f} ms  ({legacy_time / compiled_time:.1f}x)")
+    print(f"compiled modern CV:        {modern_time * 1000:8.1f} ms")
+    print(f"compiled cover letters:    {letter_time * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -17,4 +17,70 @@ class Settings:
         self.debug = False
         self.max_file_size = 5 * 1024 * 1024
 
+        # PDF text extraction limits; documents with many pages are split
+        # across worker processes
+        self.pdf_max_pages = int(os.getenv("PDF_MAX_PAGES", "50"))
+        self.pdf_time_limit = float(os.getenv("PDF_TIME_LIMIT", "10"))
+        self.pdf_parallel_min_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+        self.pdf_workers = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+        # Extracted-text cache for uploads (entries, bytes of text kept in memory)
+        self.upload_cache_size = int(os.getenv("UPLOAD_CACHE_SIZE", "64"))
+        self.upload_cache_max_bytes = int(os.getenv("UPLOAD_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+        # Rendered PDF cache (entries, bytes of PDF output kept in memory)
+        self.pdf_cache_size = int(os.getenv("PDF_CACHE_SIZE", "32"))
+        self.pdf_cache_max_bytes = int(os.getenv("PDF_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+        # Maximum number of LLM requests issued at once per generation
+        self.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "3"))
+        # Shared deadline (seconds) for concurrently generated documents
+        self.llm_request_deadline = float(os.getenv("LLM_REQUEST_DEADLINE", "90"))
+
+        # Prompt token budget for CV + job description, and completion sizing
+        self.llm_prompt_token_budget = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "6000"))
+        self.llm_output_headroom = int(os.getenv("LLM_OUTPUT_HEADROOM", "1024"))
+        self.llm_min_output_tokens = int(os.getenv("LLM_MIN_OUTPUT_TOKENS", "1024"))
+        self.llm_max_output_tokens = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "4096"))
+
+        # Shared Groq HTTP connection pool
+        self.llm_pool_max_connections = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "20"))
+        self.llm_pool_max_keepalive = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "10"))
+        self.llm_pool_keepalive_expiry = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "60"))
+
+        # Process-wide LLM rate limiting, retries and circuit breaker
+        self.llm_rate_limit_rpm = float(os.getenv("LLM_RATE_LIMIT_RPM", "30"))
+        self.llm_rate_limit_burst = float(os.getenv("LLM_RATE_LIMIT_BURST", "5"))
+        self.llm_rate_limit_max_wait = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "60"))
+        self.llm_retry_base_delay = float(os.getenv("LLM_RETRY_BASE_DELAY", "1"))
+        self.llm_retry_max_delay = float(os.getenv("LLM_RETRY_MAX_DELAY", "30"))
+        self.llm_breaker_threshold = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+        self.llm_breaker_reset_timeout = float(os.getenv("LLM_BREAKER_RESET_TIMEOUT", "30"))
+
+        # Opt-in on-disk cache of LLM responses (seconds, entries)
+        self.llm_cache_enabled = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.llm_cache_path = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite3")
+        self.llm_cache_ttl = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+        self.llm_cache_max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+        # Usage tracking writer: sink ("sheets" or "sqlite"), bounded queue,
+        # batch size and flush interval (seconds)
+        self.tracker_sink = os.getenv("TRACKER_SINK", "sheets").lower()
+        self.tracker_sqlite_path = os.getenv("TRACKER_SQLITE_PATH", "data/tracking.sqlite3")
+        self.tracker_queue_size = int(os.getenv("TRACKER_QUEUE_SIZE", "1000"))
+        self.tracker_batch_size = int(os.getenv("TRACKER_BATCH_SIZE", "50"))
+        self.tracker_flush_interval = float(os.getenv("TRACKER_FLUSH_INTERVAL", "5"))
+        # Seconds a cached worksheet handle is reused before it is reopened
+        self.tracker_handle_ttl = float(os.getenv("TRACKER_HANDLE_TTL", "3600"))
+
+        # Maximum rendered lines in the Diff Comparison preview
+        self.diff_max_lines = int(os.getenv("DIFF_MAX_LINES", "400"))
+
+        # On-disk inverted index of job postings searched with the uploaded CV
+        self.job_index_path = os.getenv("JOB_INDEX_PATH", "data/job_index")
+
+        # Keyword analysis cache (entries per cache, seconds)
+        self.analytics_cache_size = int(os.getenv("ANALYTICS_CACHE_SIZE", "128"))
+        self.analytics_cache_ttl = int(os.getenv("ANALYTICS_CACHE_TTL", "3600"))
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Local job posting index: add postings, then find the best matches for a CV.
+
+Postings are read like batch.py reads them: a directory of .txt/.md files
+(the file name is the job id) or a JSONL file with job_id, job_description
+and optional company_name/job_type. Job ids already in the index are skipped.
+
+Examples:
+    python index_jobs.py add postings.jsonl
+    python index_jobs.py search --cv my_cv.pdf --top 10
+    python index_jobs.py compact
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number, got {value}")
+    return number
+
+
+def main() -> int:
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--index', default=settings.job_index_path, help='index directory (default: JOB_INDEX_PATH)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help='index job postings')
+    add.add_argument('jobs', help='directory of job descriptions or a JSONL file')
+    search = commands.add_parser('search', help='best matching postings for a CV')
+    search.add_argument('--cv', required=True, help='CV file (PDF, DOCX or TXT)')
+    search.add_argument('--top', type=positive_int, default=10, help='number of results')
+    commands.add_parser('compact', help='merge all segments into one')
+    args = parser.parse_args()
+
+    from app.services.batch_runner import load_jobs
+    from app.utils.job_index import JobIndex
+    from batch import read_cv
+
+    index = JobIndex(args.index)
+    started = time.perf_counter()
+
+    if args.command == 'add':
+        added = index.add(job._asdict() for job in load_jobs(args.jobs))
+        print(f"Indexed {added} postings in {time.perf_counter() - started:.1f}s ({len(index)} total)")
+    elif args.command == 'compact':
+        merged = index.compact()
+        print(f"Merged {merged} segments" if merged else "Nothing to compact")
+    else:
+        cv = read_cv(args.cv)
+        if not cv.strip():
+            print(f"Could not read any text from {args.cv}", file=sys.stderr)
+            return 1
+        results = index.search(cv, k=args.top)
+        for rank, result in enumerate(results, 1):
+            company = f" ({result['company_name']})" if result.get('company_name') else ""
+            print(f"{rank:>3}. {result['match_percentage']:6.2f}%  {result['job_id']}{company}")
+        print(f"{len(results)} of {len(index)} postings in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
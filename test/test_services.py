@@ -2,19 +2,42 @@ import unittest
 from unittest.mock import Mock, patch
 import sys
 import os
+import json
+import tempfile
+import threading
+import time
 
-# Add app directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+# Add the repository root to path; the app is imported as the app package, as main.py does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from services.cv_generator import CVGenerator
-from services.cover_letter_generator import CoverLetterGenerator
-from utils.validators import Validators
+from app.services.cv_generator import CVGenerator
+from app.services.cover_letter_generator import CoverLetterGenerator
+from app.services.batch_runner import BatchJob, BatchRunner, load_jobs
+from app.services.document_pipeline import DocumentPipeline
+from app.services.llm_service import LLMService
+from app.services.response_cache import ResponseCache
+from app.services.pdf_generator import FontMetrics, PDFGenerator
+from app.services.token_budget import TokenBudget
+from app.services.google_tracker import SilentGoogleTracker
+from app.services.tracker_writer import BatchedTrackerWriter, GoogleSheetsSink, SQLiteSink, TrackingEvent, TrackingSink
+from app.services.rate_limiter import CircuitBreaker, CircuitOpenError, RetryPolicy
+from app.utils.validators import Validators
+from app.utils.keyword_extractor import keyword_extractor
+from app.utils.analytics import CVAnalytics
+from app.utils.cache import LRUCache
+from app.utils.cv_model import ExperienceEntry
+from app.utils.cv_parser import cv_parser, parse_cv
+from app.utils.diff_renderer import DiffRenderer
+from app.utils.file_handler import FileHandler
+from app.utils.job_index import JobIndex
+from app.templates.cv_template import CVTemplate, CoverLetterTemplate
+from app.templates.template_engine import compile_template
 
 class TestCVGenerator(unittest.TestCase):
     def setUp(self):
         self.cv_generator = CVGenerator()
     
-    @patch('services.cv_generator.LLMService')
+    @patch('app.services.cv_generator.LLMService')
     def test_generate_tailored_cv(self, mock_llm_service):
         # Mock the LLM response
         mock_llm_service.return_value.generate_response.return_value = '{"professional_summary": "Test summary"}'
@@ -27,6 +50,462 @@ class TestCVGenerator(unittest.TestCase):
         self.assertIsInstance(result, dict)
         self.assertIn("professional_summary", result)
 
+class TestLLMService(unittest.TestCase):
+    def test_services_share_pooled_client(self):
+        self.assertIs(LLMService().client, LLMService().client)
+
+    def test_stream_response_yields_chunks(self):
+        service = LLMService()
+        service.client = Mock()
+        chunks = []
+        for content in ["Dear ", None, "Hiring Manager"]:
+            choice = Mock()
+            choice.delta.content = content
+            chunks.append(Mock(choices=[choice]))
+        service.client.chat.completions.create.return_value = iter(chunks)
+
+        self.assertEqual(list(service.stream_response("system", "user")), ["Dear ", "Hiring Manager"])
+        self.assertTrue(service.client.chat.completions.create.call_args.kwargs["stream"])
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_depends_on_all_inputs(self):
+        key = ResponseCache.make_key("model", "system", "user", 0.2, 2048)
+
+        self.assertEqual(key, ResponseCache.make_key("model", "system", "user", 0.2, 2048))
+        self.assertNotEqual(key, ResponseCache.make_key("model", "system", "user", 0.7, 2048))
+        self.assertNotEqual(key, ResponseCache.make_key("model", "system", "user", 0.2, 1024))
+
+    def test_size_eviction(self):
+        cache = ResponseCache(self.path, max_entries=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.set("c", "C")
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), "C")
+
+    @patch('app.services.response_cache.time.time')
+    def test_ttl_expiry(self, mock_time):
+        cache = ResponseCache(self.path, ttl=60)
+        mock_time.return_value = 1000
+        cache.set("a", "A")
+        mock_time.return_value = 1061
+
+        self.assertIsNone(cache.get("a"))
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_retry_after_headers(self):
+        error = Mock(response=Mock(headers={"retry-after": "7"}))
+        self.assertEqual(RetryPolicy.retry_after(error), 7)
+
+        error = Mock(response=Mock(headers={
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "2m59.5s",
+        }))
+        self.assertEqual(RetryPolicy.retry_after(error), 179.5)
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        delays = [policy.backoff(10) for _ in range(50)]
+
+        self.assertTrue(all(0 <= delay <= 4 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_circuit_breaker_opens_after_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+
+        self.assertRaises(CircuitOpenError, breaker.before_request)
+        breaker.record_success()
+        breaker.before_request()
+
+class TestTokenBudget(unittest.TestCase):
+    def test_compact_template_strips_indentation(self):
+        template = """
+            TASK:
+                Do this
+
+
+            OUTPUT: {cv}
+            """
+        self.assertEqual(TokenBudget.compact_template(template), "TASK:\nDo this\n\nOUTPUT: {cv}")
+
+    def test_fit_drops_low_signal_sections_first(self):
+        job_description = "Requirements:\nPython and SQL\nBenefits:\n" + "Free lunch and gym\n" * 50
+        cv, job = TokenBudget.fit("Python developer", job_description, budget=50)
+
+        self.assertEqual(job, "Requirements:\nPython and SQL")
+        self.assertEqual(cv, "Python developer")
+
+    def test_only_whole_low_signal_headings_dropped(self):
+        text = "\n".join([
+            "Research Interests:", "Distributed systems",
+            "Data Privacy Requirements:", "GDPR experience",
+            "PUBLICATIONS & REFERENCES", "Paper at VLDB",
+            "**Benefits & Perks**", "Free lunch",
+            "EEO Statement:", "We are an equal opportunity employer"
+        ])
+
+        self.assertEqual(TokenBudget.drop_low_signal_sections(text), "\n".join([
+            "Research Interests:", "Distributed systems",
+            "Data Privacy Requirements:", "GDPR experience",
+            "PUBLICATIONS & REFERENCES", "Paper at VLDB"
+        ]))
+
+    def test_completion_tokens_are_clamped(self):
+        self.assertEqual(TokenBudget.completion_tokens(100, 1024, 1024, 4096), 1124)
+        self.assertEqual(TokenBudget.completion_tokens(9000, 1024, 1024, 4096), 4096)
+
+class TestCoverLetterGenerator(unittest.TestCase):
+    @patch('app.services.cover_letter_generator.LLMService')
+    def test_generate_cover_letters_runs_tones_concurrently(self, mock_llm_service):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_response(system_prompt, user_prompt, **kwargs):
+            barrier.wait()  # only passes if all three requests are in flight
+            return system_prompt
+
+        mock_llm_service.return_value.generate_response.side_effect = fake_response
+        generator = CoverLetterGenerator()
+
+        letters = generator.generate_cover_letters("CV", "Job", tones=["professional", "enthusiastic", "creative"])
+
+        self.assertEqual(list(letters), ["professional", "enthusiastic", "creative"])
+        self.assertIn("enthusiastic tone", letters["enthusiastic"])
+
+    @patch('app.services.cover_letter_generator.settings.llm_max_concurrency', 0)
+    @patch('app.services.cover_letter_generator.LLMService')
+    def test_zero_concurrency_setting_still_runs(self, mock_llm_service):
+        mock_llm_service.return_value.generate_response.side_effect = lambda system_prompt, user_prompt, **kwargs: "letter"
+
+        letters = CoverLetterGenerator().generate_cover_letters("CV", "Job", tones=["professional", "creative"])
+
+        self.assertEqual(list(letters), ["professional", "creative"])
+
+class TestDocumentPipeline(unittest.TestCase):
+    def test_partial_result_when_one_leg_fails(self):
+        cv_generator = Mock()
+        cv_generator.generate_tailored_cv.return_value = "Tailored CV"
+        cover_letter_generator = Mock()
+        cover_letter_generator.generate_cover_letter.side_effect = Exception("rate limited")
+
+        result = DocumentPipeline(cv_generator, cover_letter_generator).generate_both("CV", "Job")
+
+        self.assertEqual(result["cv"], "Tailored CV")
+        self.assertIsNone(result["cover_letter"])
+        self.assertEqual(result["errors"], {"cover_letter": "rate limited"})
+        self.assertIn("cv", result["timings"])
+        self.assertIn("total", result["timings"])
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp_dir.name, "results.jsonl")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_jobs_from_jsonl(self):
+        path = os.path.join(self.tmp_dir.name, "jobs.jsonl")
+        with open(path, "w") as f:
+            f.write('{"job_id": "a", "job_description": "Python role", "company_name": "Acme"}\n')
+            f.write('not json\n{"id": 7, "description": "Go role"}\n{"job_id": "empty"}\n')
+
+        jobs = list(load_jobs(path))
+
+        self.assertEqual(jobs, [BatchJob("a", "Python role", "Acme"), BatchJob("7", "Go role", "")])
+
+    def test_resume_skips_completed_jobs(self):
+        cv_generator = Mock()
+        cv_generator.generate_tailored_cv.side_effect = lambda cv, jd, **kwargs: f"CV for {jd}"
+        cover_letter_generator = Mock()
+        cover_letter_generator.generate_cover_letter.side_effect = [RuntimeError("rate limited"), "Letter", "Letter"]
+        runner = BatchRunner(DocumentPipeline(cv_generator, cover_letter_generator), max_concurrency=1)
+        jobs = [BatchJob("a", "Python role"), BatchJob("b", "Go role")]
+
+        first = runner.run("Python developer", iter(jobs), self.output)
+        second = runner.run("Python developer", iter(jobs), self.output)
+
+        with open(self.output) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual((first["ok"], first["failed"]), (1, 1))
+        self.assertEqual((second["ok"], second["skipped"]), (1, 1))
+        self.assertEqual([(r["job_id"], r["status"]) for r in records], [("a", "error"), ("b", "ok"), ("a", "ok")])
+        self.assertEqual(records[-1]["cv"], "CV for Python role")
+
+class TestFileHandler(unittest.TestCase):
+    @staticmethod
+    def _make_pdf(pages: int) -> bytes:
+        from io import BytesIO
+        from reportlab.pdfgen import canvas
+
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer)
+        for page in range(pages):
+            pdf.drawString(40, 800, f"Page {page}")
+            pdf.showPage()
+        pdf.save()
+        return buffer.getvalue()
+
+    def test_parallel_extraction_keeps_page_order(self):
+        data = self._make_pdf(10)
+
+        pages = FileHandler._extract_pages_parallel(data, 10, time_limit=30)
+
+        self.assertEqual([page.strip() for page in pages], [f"Page {page}" for page in range(10)])
+
+    def test_timed_out_pool_is_retired_after_other_users(self):
+        from app.utils import file_handler
+
+        data = self._make_pdf(10)
+        # Another session's extraction, still running on the shared pool
+        pool = file_handler._page_pool.acquire()
+        other = pool.apply_async(file_handler._extract_page_range, (data, 0, 10))
+
+        pages = FileHandler._extract_pages_parallel(data, 10, time_limit=0)
+
+        self.assertEqual(pages, [])
+        self.assertEqual(len(other.get(timeout=30)), 10)
+        fresh = file_handler._page_pool.acquire()
+        file_handler._page_pool.release(fresh)
+        self.assertIsNot(fresh, pool)
+        file_handler._page_pool.release(pool)  # the last user terminates the retired pool
+        with self.assertRaises(ValueError):
+            pool.apply_async(file_handler._extract_page_range, (data, 0, 1))
+
+    @patch('app.utils.file_handler.st')
+    @patch('app.utils.file_handler.settings')
+    def test_warns_when_page_cap_truncates(self, mock_settings, mock_st):
+        from io import BytesIO
+
+        mock_settings.pdf_max_pages = 2
+        mock_settings.pdf_workers = 1
+        mock_settings.pdf_time_limit = 30
+
+        text = FileHandler.extract_text_from_pdf(BytesIO(self._make_pdf(5)))
+
+        self.assertEqual(text.split(), ["Page", "0", "Page", "1"])
+        mock_st.warning.assert_called_once_with("Only the first 2 of 5 pages were read (the limit is 2 pages).")
+
+    def test_iter_pdf_pages_respects_page_cap(self):
+        from io import BytesIO
+
+        pages = list(FileHandler.iter_pdf_pages(BytesIO(self._make_pdf(5)), max_pages=2))
+
+        self.assertEqual([page.strip() for page in pages], ["Page 0", "Page 1"])
+
+    @patch('app.utils.file_handler.st')
+    @patch('app.utils.file_handler.FileHandler._extract_pdf',
+           return_value=("CV text", "Only the first 50 of 60 pages were read (the limit is 50 pages).", True))
+    def test_extraction_cached_by_content(self, mock_extract, mock_st):
+        from io import BytesIO
+
+        first = BytesIO(b"%PDF-cached-upload")
+        first.name = "cv.pdf"
+        second = BytesIO(b"%PDF-cached-upload")
+        second.name = "renamed.pdf"
+
+        self.assertEqual(FileHandler.extract_text_from_file(first), "CV text")
+        self.assertEqual(FileHandler.extract_text_from_file(second), "CV text")
+        self.assertEqual(mock_extract.call_count, 1)
+        # The page limit warning comes back with the cached text
+        self.assertEqual(mock_st.warning.call_count, 2)
+
+    @patch('app.utils.file_handler.st')
+    @patch('app.utils.file_handler.FileHandler._extract_pdf',
+           return_value=("Partial text", "Only the first 3 of 20 pages could be read in time.", False))
+    def test_time_limited_extraction_not_cached(self, mock_extract, mock_st):
+        from io import BytesIO
+
+        for _ in range(2):
+            upload = BytesIO(b"%PDF-slow-upload")
+            upload.name = "cv.pdf"
+            self.assertEqual(FileHandler.extract_text_from_file(upload), "Partial text")
+
+        self.assertEqual(mock_extract.call_count, 2)
+
+class TestPDFGenerator(unittest.TestCase):
+    def test_output_memoized_per_content(self):
+        with patch.object(PDFGenerator, '_render', wraps=PDFGenerator._render) as mock_render:
+            first = PDFGenerator.generate_pdf("Memoized PDF\nSecond line")
+            second = PDFGenerator.generate_pdf("Memoized PDF\nSecond line")
+
+        self.assertEqual(mock_render.call_count, 1)
+        self.assertIsNot(first, second)
+        self.assertTrue(first.read().startswith(b"%PDF"))
+        self.assertEqual(second.read(), first.getvalue())
+
+    def test_bulk_exports(self):
+        import zipfile
+        import PyPDF2
+
+        archive = zipfile.ZipFile(PDFGenerator.generate_archive({"cv.pdf": "CV", "letter.pdf": "Letter"}))
+        combined = PyPDF2.PdfReader(PDFGenerator.generate_combined_pdf([("CV", "CV"), ("Letter", "Letter")]))
+
+        self.assertEqual(archive.namelist(), ["cv.pdf", "letter.pdf"])
+        self.assertEqual(archive.read("cv.pdf"), PDFGenerator.generate_pdf("CV").getvalue())
+        self.assertEqual(len(combined.pages), 2)
+        self.assertEqual([entry.title for entry in combined.outline], ["CV", "Letter"])
+
+        with patch.object(PDFGenerator, '_build_archive') as build:
+            again = PDFGenerator.generate_archive({"cv.pdf": "CV", "letter.pdf": "Letter"})
+        build.assert_not_called()
+        self.assertEqual(zipfile.ZipFile(again).namelist(), ["cv.pdf", "letter.pdf"])
+
+    def test_layout_wraps_and_paginates(self):
+        layout = PDFGenerator._text_layout()
+        metrics = FontMetrics.for_font(PDFGenerator.FONT_NAME)
+        content = "# Jane Doe\nEXPERIENCE\n- " + "delivered " * 40 + "\n" + "paragraph " * 2000
+
+        pages = list(layout.layout(content))
+        lines = [line for page in pages for line in page]
+
+        self.assertGreater(len(pages), 1)
+        self.assertEqual((lines[0].text, lines[0].font_name), ("Jane Doe", PDFGenerator.HEADING_FONT_NAME))
+        self.assertEqual(lines[1].text, "EXPERIENCE")
+        self.assertEqual(lines[2].text, layout.BULLET)
+        for line in lines:
+            self.assertGreaterEqual(line.y, PDFGenerator.MARGIN)
+            self.assertLessEqual(line.x + metrics.width(line.text, line.font_size),
+                                 layout.width - PDFGenerator.MARGIN + 0.01)
+
+    def test_blank_lines_never_push_text_off_the_page(self):
+        layout = PDFGenerator._text_layout()
+
+        pages = list(layout.layout("\n" * 60 + "After the gap\n" + "Line\n" * 40 + "\n" * 60 + "End"))
+        lines = [line for page in pages for line in page]
+
+        self.assertTrue(all(page for page in pages))
+        self.assertEqual(lines[0].text, "After the gap")
+        self.assertEqual(lines[-1].text, "End")
+        for line in lines:
+            self.assertGreaterEqual(line.y, PDFGenerator.MARGIN)
+
+class TestTrackerWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.sink = SQLiteSink(os.path.join(self.tmp_dir.name, "tracking.sqlite3"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_events_batched_and_coalesced(self):
+        tracker = SilentGoogleTracker(sink=self.sink)
+        tracker.track_cv_upload("Jane Doe\njane@example.com\nPython skills", "cv.pdf", "s1")
+        tracker.track_generation_results("cv", "python developer role", "first cv", "first letter", "s1", "Acme")
+        tracker.track_generation_results("cv", "python developer role", "final cv", "final letter", "s1", "Acme")
+        tracker.track_generation_results("cv", "job", "cv", "letter", "unknown-session")
+        self.assertTrue(tracker.flush(timeout=10))
+
+        rows = self.sink.rows()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][1:4], ["s1", "CV_UPLOAD", "cv.pdf"])
+        self.assertEqual(rows[0][13:16], ["Acme", "final cv", "final letter"])
+        self.assertEqual(tracker.stats()["coalesced"], 2)
+
+    def test_updates_existing_rows(self):
+        writer = BatchedTrackerWriter(self.sink, flush_interval=0.01)
+        writer.submit(TrackingEvent("append", "s1", lambda: ["t", "s1"] + [""] * 16))
+        writer.flush(timeout=10)
+        writer.submit(TrackingEvent("update", "s1", lambda: ["Acme", "cv", "letter", "python"]))
+        writer.flush(timeout=10)
+
+        self.assertEqual(self.sink.rows()[0][13:17], ["Acme", "cv", "letter", "python"])
+        self.assertEqual(writer.stats()["batches"], 2)
+
+    def test_incomplete_sink_rejected_at_construction(self):
+        class AppendOnlySink(TrackingSink):
+            def append_rows(self, rows):
+                pass
+
+        with self.assertRaises(TypeError):
+            AppendOnlySink()
+
+    def test_flush_times_out_when_queue_full(self):
+        release = threading.Event()
+        sink = Mock()
+        sink.append_rows.side_effect = lambda rows: release.wait(10)  # a stalled sheet
+        writer = BatchedTrackerWriter(sink, max_queue=1, batch_size=1, flush_interval=0.01)
+        writer.submit(TrackingEvent("append", "s1", lambda: ["t", "s1"]))
+        while not sink.append_rows.called:
+            time.sleep(0.01)
+        writer.submit(TrackingEvent("append", "s2", lambda: ["t", "s2"]))  # fills the queue
+
+        start = time.monotonic()
+        self.assertFalse(writer.flush(timeout=0.2))
+        self.assertLess(time.monotonic() - start, 2)
+        release.set()
+        self.assertTrue(writer.flush(timeout=10))
+
+    def test_sheets_sink_indexes_rows(self):
+        worksheet = Mock()
+        worksheet.col_values.return_value = ["Session_ID", "s1"]
+        worksheet.append_rows.return_value = {"updates": {"updatedRange": "Sheet1!A3:R4"}}
+        client = Mock()
+        client.open_by_key.return_value.sheet1 = worksheet
+        sink = GoogleSheetsSink(client, "sheet-id")
+
+        sink.update_sessions({"s1": ["Acme", "cv", "letter", "python"]})
+        sink.append_rows([["t", "s2"], ["t", "s3"]])
+        sink.update_sessions({"s3": ["Beta", "cv", "letter", "go"], "s2": ["Gamma", "cv", "letter", "sql"]})
+
+        worksheet.col_values.assert_called_once_with(2)
+        worksheet.get_all_values.assert_not_called()
+        self.assertEqual(worksheet.batch_update.call_args_list[0].args[0],
+                         [{"range": "N2:Q2", "values": [["Acme", "cv", "letter", "python"]]}])
+        self.assertEqual([entry["range"] for entry in worksheet.batch_update.call_args.args[0]], ["N4:Q4", "N3:Q3"])
+
+    def test_sheets_sink_reuses_and_refreshes_handle(self):
+        import gspread
+
+        stale = Mock()
+        stale.append_rows.side_effect = gspread.exceptions.APIError(
+            Mock(status_code=404, json=Mock(return_value={"error": {"code": 404, "message": "gone", "status": "NOT_FOUND"}}))
+        )
+        fresh = Mock()
+        client = Mock()
+        client.open_by_key.side_effect = [Mock(sheet1=stale), Mock(sheet1=fresh)]
+        sink = GoogleSheetsSink(client, "sheet-id")
+
+        sink.append_rows([["t", "s1"]])
+        sink.append_rows([["t", "s2"]])
+
+        self.assertEqual(client.open_by_key.call_count, 2)
+        self.assertEqual(fresh.append_rows.call_count, 2)
+
+    def test_full_queue_drops_events(self):
+        release = threading.Event()
+
+        class BlockingSink(TrackingSink):
+            def append_rows(self, rows):
+                release.wait(10)
+
+            def update_sessions(self, updates):
+                pass
+
+        writer = BatchedTrackerWriter(BlockingSink(), max_queue=1, batch_size=1)
+        row = lambda: ["t", "s"]
+        writer.submit(TrackingEvent("append", "s", row))  # taken by the writer, which then blocks
+        deadline = time.monotonic() + 5
+        while writer.stats()["queue_depth"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        accepted = [writer.submit(TrackingEvent("append", "s", row)) for _ in range(3)]
+        stats = writer.stats()
+        release.set()
+
+        self.assertEqual(accepted, [True, False, False])
+        self.assertEqual(stats["dropped"], 2)
+        self.assertEqual(stats["backpressure"], 1.0)
+
 class TestValidators(unittest.TestCase):
     def test_validate_email(self):
         self.assertTrue(Validators.validate_email("test@example.com"))
@@ -40,5 +519,326 @@ class TestValidators(unittest.TestCase):
         self.assertTrue(validations["has_experience"])
         self.assertTrue(validations["has_education"])
 
+class TestCVParser(unittest.TestCase):
+    def setUp(self):
+        self.cv = "\n".join([
+            "Curriculum Vitae",
+            "Jane Doe",
+            "jane.doe@example.com | +90 532 123 45 67",
+            "Berlin, Germany",
+            "Relocating to Istanbul",
+            "Summary: 7+ years of experience in data engineering",
+            "Technical Skills",
+            "Python, SQL",
+            "",
+            "Docker",
+            "Kubernetes",
+            "Terraform",
+            "BSc Computer Engineering, Bogazici University"
+        ])
+
+    def test_parse_fields(self):
+        parsed = cv_parser.parse(self.cv)
+
+        self.assertEqual(parsed.contact.name, "Jane Doe")
+        self.assertEqual(parsed.contact.email, "jane.doe@example.com")
+        self.assertEqual(parsed.contact.phone, "+90 532 123 45 67")
+        self.assertEqual(parsed.contact.location, "Relocating to Istanbul")  # preferred over Germany
+        self.assertEqual(parsed.skills.summary, "Technical Skills | Python, SQL | Docker | Kubernetes")
+        self.assertEqual(parsed.skills.items, ["Python", "SQL", "Docker", "Kubernetes"])
+        self.assertEqual(parsed.experience_years, "7 years")
+        self.assertEqual(parsed.education.summary, "BSc Computer Engineering, Bogazici University")
+        self.assertEqual(parsed.word_count, len(self.cv.split()))
+
+    def test_lines_found_when_lowercasing_changes_length(self):
+        parsed = cv_parser.parse("İzmir Office\n" + self.cv)
+
+        self.assertEqual(parsed.contact.location, "Relocating to Istanbul")
+        self.assertEqual(parsed.education.summary, "BSc Computer Engineering, Bogazici University")
+
+    def test_missing_fields_are_empty(self):
+        parsed = cv_parser.parse("Jane Doe")
+
+        self.assertEqual(parsed.contact.name, "Jane Doe")
+        self.assertEqual(
+            [parsed.contact.email, parsed.contact.phone, parsed.contact.location,
+             parsed.skills.summary, parsed.experience_years, parsed.education.summary],
+            [""] * 6
+        )
+        self.assertEqual(parsed.experience, [])
+
+    def test_experience_and_education_sections(self):
+        parsed = cv_parser.parse("\n".join([
+            "Jane Doe",
+            "WORK EXPERIENCE",
+            "Senior Data Engineer | Acme Corp",
+            "2020 - Present",
+            "- Built the streaming platform",
+            "- Cut costs by 30%",
+            "",
+            "Data Analyst at Initech | 2017 - 2020",
+            "- Automated reporting",
+            "",
+            "Education:",
+            "MSc Computer Science, TU Munich",
+            "BSc Mathematics, METU"
+        ]))
+
+        self.assertEqual(parsed.experience, [
+            ExperienceEntry("Senior Data Engineer", "Acme Corp", "2020 - Present",
+                            "- Built the streaming platform\n- Cut costs by 30%"),
+            ExperienceEntry("Data Analyst", "Initech", "2017 - 2020", "- Automated reporting")
+        ])
+        self.assertEqual(parsed.education.entries, ["MSc Computer Science, TU Munich", "BSc Mathematics, METU"])
+
+    def test_model_is_slotted_and_shared(self):
+        parsed = parse_cv(self.cv)
+
+        self.assertFalse(hasattr(parsed, "__dict__"))
+        self.assertFalse(hasattr(parsed.contact, "__dict__"))
+        with self.assertRaises(AttributeError):
+            parsed.unknown = 1
+        self.assertIs(parse_cv(self.cv), parsed)
+
+        analysis = CVAnalytics.analyze_keyword_match(parsed, "Python and Kubernetes engineer")
+        self.assertEqual(analysis, CVAnalytics.analyze_keyword_match(self.cv, "Python and Kubernetes engineer"))
+        self.assertIsNotNone(parsed.keywords)
+
+class TestCVAnalytics(unittest.TestCase):
+    def test_dashboard_tables_precomputed(self):
+        analysis = CVAnalytics.analyze_keyword_match(
+            "Python developer with AWS",
+            "Senior Python engineer with AWS and Kubernetes"
+        )
+        table = CVAnalytics._keyword_frame(analysis["top_matching_detail"])
+
+        self.assertEqual(list(table["Keyword"]), analysis["matching_keywords"])
+        self.assertEqual(analysis["top_job_keywords"][0], ("aws", 4, True))
+        self.assertIn(("kubernetes", 3, False), analysis["top_job_keywords"])
+
+    def test_batch_match_agrees_with_pairwise(self):
+        cv = "Python developer with AWS, Docker and machine learning experience"
+        jobs = [
+            "Senior Python engineer with AWS and Kubernetes",
+            "Data scientist: machine learning, SQL, statistics, Python",
+            "",
+            "Go developer, Kubernetes, Terraform, AWS, AWS"
+        ]
+
+        batch = CVAnalytics.batch_keyword_match(cv, jobs)
+
+        for job, result in zip(jobs, batch):
+            pairwise = CVAnalytics.analyze_keyword_match(cv, job)
+            self.assertEqual(result["match_percentage"], pairwise["match_percentage"])
+            self.assertEqual(result["missing_keywords"], pairwise["missing_keywords"])
+            self.assertEqual(result["high_priority_missing"], pairwise["high_priority_missing"])
+
+    def test_batch_match_leaves_cache_counters_alone(self):
+        from app.utils import analytics
+
+        cv = "Python developer with AWS"
+        CVAnalytics.batch_keyword_match(cv, ["Python engineer"])  # warms the CV's keywords
+        before = analytics._keyword_cache.stats()
+        CVAnalytics.batch_keyword_match(cv, ["Go developer with Kubernetes", "Data scientist, SQL"])
+        after = analytics._keyword_cache.stats()
+
+        self.assertEqual(after["misses"], before["misses"])
+
+class TestJobIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = JobIndex(os.path.join(self.directory.name, "jobs"))
+        self.cv = "Python developer with AWS, Docker and machine learning experience"
+        self.jobs = [
+            {"job_id": "backend", "job_description": "Senior Python engineer with AWS and Kubernetes"},
+            {"job_id": "data", "job_description": "Data scientist: machine learning, SQL, statistics, Python"},
+            {"job_id": "infra", "job_description": "Go developer, Kubernetes, Terraform, AWS, AWS"},
+            {"job_id": "sales", "job_description": "Account executive, CRM, quota, negotiation", "company_name": "Acme"}
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def expected_ranking(self, jobs):
+        scores = [(CVAnalytics.analyze_keyword_match(self.cv, job["job_description"])["match_percentage"], i)
+                  for i, job in enumerate(jobs)]
+        return [(jobs[i]["job_id"], score) for score, i in sorted(scores, key=lambda x: (-x[0], x[1])) if score > 0]
+
+    def test_search_matches_analyze_scores_across_segments(self):
+        self.assertEqual(self.index.add(self.jobs[:2]), 2)
+        self.assertEqual(self.index.add(self.jobs), 2)  # already indexed ids are skipped
+        self.assertEqual(len(self.index), 4)
+
+        results = self.index.search(self.cv, k=10)
+        self.assertEqual([(r["job_id"], r["match_percentage"]) for r in results], self.expected_ranking(self.jobs))
+        self.assertEqual(results[0]["job_description"], next(
+            job["job_description"] for job in self.jobs if job["job_id"] == results[0]["job_id"]
+        ))
+        self.assertEqual(len(self.index.search(self.cv, k=1)), 1)
+        self.assertEqual(self.index.search(self.cv, k=0), [])
+
+    def test_compact_keeps_results(self):
+        for job in self.jobs:
+            self.index.add([job])
+        before = self.index.search(self.cv, k=10)
+
+        self.assertEqual(self.index.compact(), 4)
+        self.assertEqual(len(os.listdir(self.index.path)), 2)  # manifest and one segment
+        self.assertEqual(JobIndex(self.index.path).search(self.cv, k=10), before)
+
+class TestDiffRenderer(unittest.TestCase):
+    def test_inserted_line_only_changes_itself(self):
+        original = "\n".join(f"line {i}" for i in range(20))
+        generated = original.replace("line 10", "line 10\nNew <b>line</b>")
+
+        rendered = DiffRenderer.render_html(original, generated, context=1)
+
+        self.assertIn("1 line added, 0 lines removed", rendered)
+        self.assertIn("+ New &lt;b&gt;line&lt;/b&gt;", rendered)
+        self.assertIn("10 unchanged lines", rendered)
+        self.assertNotIn("line 3", rendered)
+
+    def test_word_highlighting_and_cap(self):
+        rendered = DiffRenderer.render_html("Python developer", "Senior Python engineer")
+        capped = DiffRenderer.render_html("a\nb\nc", "x\ny\nz", max_lines=2)
+
+        self.assertIn(f'<span style="{DiffRenderer.WORD_ADDED_STYLE}">engineer</span>', rendered)
+        self.assertIn(f'<span style="{DiffRenderer.WORD_REMOVED_STYLE}">developer</span>', rendered)
+        self.assertIn("Showing the first 2 lines", capped)
+        self.assertEqual(capped.count("<div style=\"background"), 2)
+
+class TestKeywordExtractor(unittest.TestCase):
+    def test_weights(self):
+        keywords = keyword_extractor.extract(
+            "Senior ML engineer building Large  Language\nModels with Python and AWS. Python lead."
+        )
+
+        self.assertEqual(keywords["ml"], 4)  # abbreviation + acronym
+        self.assertEqual(keywords["large language models"], 3)
+        self.assertEqual(keywords["language models"], 3)
+        self.assertEqual(keywords["language model"], 3)
+        self.assertEqual(keywords["python"], 6)
+        self.assertEqual(keywords["senior"], 2.5)
+        self.assertNotIn("with", keywords)
+
+    def test_compound_terms_match_inside_words(self):
+        keywords = keyword_extractor.extract("bigdata science on Azure DevOps, back-end")
+
+        self.assertEqual(keywords["data science"], 3)
+        self.assertEqual(keywords["devops"], 3)
+        self.assertNotIn("back end", keywords)
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_and_counters(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)  # evicts "b", the least recently used
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_peek_is_not_counted(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        self.assertEqual(cache.peek("a"), 1)
+        self.assertIsNone(cache.peek("missing"))
+        cache.set("c", 3)  # "a" was only peeked at, so it is still the least recently used
+
+        self.assertIsNone(cache.peek("a"))
+        self.assertEqual(cache.stats()["hits"], 0)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+    @patch('app.utils.cache.time.monotonic')
+    def test_ttl_expiry(self, mock_monotonic):
+        cache = LRUCache(max_entries=2, ttl=10)
+        mock_monotonic.return_value = 100
+        cache.set("a", 1)
+        mock_monotonic.return_value = 111
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_byte_bound(self):
+        cache = LRUCache(max_entries=10, max_bytes=10)
+        cache.set("a", "x" * 6)
+        cache.set("b", "y" * 6)  # evicts "a" to stay within 10 bytes
+        cache.set("c", "z" * 11)  # larger than the whole cache, not stored
+
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.get("b"), "y" * 6)
+        self.assertEqual(cache.stats()["bytes"], 6)
+
+class TestCVTemplate(unittest.TestCase):
+    def setUp(self):
+        self.cv_data = {
+            'contact_info': "Jane Doe\njane@example.com",
+            'professional_summary': "Data engineer",
+            'key_skills': ["Python", "SQL"],
+            'work_experience': [
+                {'role': "Engineer", 'company': "Acme", 'duration': "2020 - Present", 'achievements': "- Built {things}"},
+                {'role': "Analyst"}
+            ],
+            'education': "BSc Computer Science"
+        }
+
+    def test_professional_cv(self):
+        cv = CVTemplate.format_professional_cv(self.cv_data)
+
+        self.assertTrue(cv.startswith("Jane Doe\njane@example.com\n\nPROFESSIONAL SUMMARY\nData engineer"))
+        self.assertIn("KEY SKILLS\nPython • SQL\n", cv)
+        self.assertIn("WORK EXPERIENCE\nEngineer | Acme\n2020 - Present\n- Built {things}\n\n\nAnalyst |\n\nEDUCATION\nBSc Computer Science", cv)
+
+    def test_modern_cv_is_filled_in(self):
+        cv = CVTemplate.format_modern_cv(self.cv_data)
+
+        self.assertNotIn("{", cv.replace("{things}", ""))
+        self.assertIn("🎯 PROFESSIONAL SUMMARY\nData engineer", cv)
+        self.assertIn("🚀 PROFESSIONAL EXPERIENCE\n▸ Engineer | Acme\n", cv)
+        self.assertIn("🎓 EDUCATION & QUALIFICATIONS\nBSc Computer Science", cv)
+
+    def test_parsed_cv_and_entries(self):
+        parsed = cv_parser.parse("Jane Doe\nEXPERIENCE\nEngineer | Acme\n2020 - Present\n- Built it")
+        entries = [ExperienceEntry("Engineer", "Acme", "2020 - Present", "- Built it")]
+
+        self.assertEqual(parsed.experience, entries)
+        self.assertEqual(
+            CVTemplate.format_professional_cv(parsed),
+            CVTemplate.format_professional_cv({'contact_info': "Jane Doe", 'work_experience': entries})
+        )
+        # Entries of different kinds are rendered one by one
+        mixed = CVTemplate.format_professional_cv({'work_experience': entries + ["Freelance work"]})
+        self.assertIn("Engineer | Acme\n2020 - Present\n- Built it\n\nFreelance work\n\nEDUCATION", mixed)
+
+    def test_cover_letter(self):
+        letter = CoverLetterTemplate.format_professional_cover_letter(
+            "I'd like to apply.", "Acme", applicant_name="Jane Doe"
+        )
+
+        self.assertTrue(letter.startswith("Jane Doe\n[Your Address]"))
+        self.assertIn("Hiring Manager\nAcme\n[Company Address]\n\nDear Hiring Manager,\n\nI'd like to apply.", letter)
+        self.assertTrue(letter.endswith("Sincerely,\nJane Doe"))
+
+    def test_compiled_template(self):
+        template = compile_template("{name} {{literal}} '{quote}'\\")
+
+        self.assertIs(compile_template("{name} {{literal}} '{quote}'\\"), template)
+        self.assertEqual(template.fields, ('name', 'quote'))
+        self.assertEqual(template.render({'name': "a", 'quote': 1}), "a {literal} '1'\\")
+        with self.assertRaises(KeyError):
+            template.render({'name': "a"})
+
+    def test_unsupported_fields(self):
+        for source in ("{0}", "{a.b}", "{a[0]}", "{a!r}", "{a:>10}"):
+            with self.assertRaises(ValueError):
+                compile_template(source)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file